@@ -0,0 +1,85 @@
+"""
+Benchmark - Duplicate detection with 1 to N hashing workers
+
+Usage:
+    python benchmarks/bench_hashing.py [folder] [max_workers]
+
+Without a folder argument a synthetic set of duplicate files is generated
+in a temp directory. Note that a warm page cache hides disk seeks; on a
+cold spinning disk the in-flight byte cap matters more than worker count.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.duplicates import HashPool, find_duplicates
+from core.hash_cache import HashCache
+from core.scanner import FileScanner
+
+
+def make_duplicates(base, groups=16, copies=4, size=8 * 1024 * 1024):
+    """Create groups of identical files plus same-size decoys, return total bytes"""
+    total = 0
+    for g in range(groups):
+        data = os.urandom(size)
+        for c in range(copies):
+            with open(os.path.join(base, f"dup{g}_{c}.bin"), 'wb') as fh:
+                fh.write(data)
+            total += size
+        # Same size and same ends, different middle: survives the partial hash
+        decoy = bytearray(data)
+        decoy[size // 2] ^= 0xFF
+        with open(os.path.join(base, f"decoy{g}.bin"), 'wb') as fh:
+            fh.write(decoy)
+        total += size
+    return total
+
+
+def main():
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1) * 2
+
+    if len(sys.argv) > 1:
+        folder = sys.argv[1]
+        tmp = None
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        folder = tmp.name
+        total = make_duplicates(folder)
+        # Files this fresh are too new to cache
+        old = time.time() - 3600
+        for name in os.listdir(folder):
+            os.utime(os.path.join(folder, name), (old, old))
+        print(f"Generated {total / 1024 ** 2:.0f} MB of files in {folder}")
+
+    try:
+        files = [(entry.path, entry.size) for entry in FileScanner().scan(folder)]
+        workers = 1
+        baseline = None
+        while workers <= max_workers:
+            start = time.perf_counter()
+            groups = find_duplicates(files, HashPool(workers))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:3} workers : {elapsed:8.3f}s  {len(groups)} groups  ({baseline / elapsed:.1f}x)")
+            workers *= 2
+
+        # Repeat runs reuse digests of unchanged files
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = HashCache(Path(cache_dir) / "hash_cache.db")
+            for run in ("cold", "warm"):
+                start = time.perf_counter()
+                groups = find_duplicates(files, HashPool(max_workers, cache=cache))
+                elapsed = time.perf_counter() - start
+                print(f"cache {run:4}  : {elapsed:8.3f}s  {len(groups)} groups  ({baseline / elapsed:.1f}x)")
+    finally:
+        if tmp:
+            tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
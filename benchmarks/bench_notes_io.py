@@ -0,0 +1,73 @@
+"""
+Benchmark - Bulk note export and import through JSON Lines
+
+Usage:
+    python benchmarks/bench_notes_io.py [notes]
+
+Fills a temporary note store with synthetic notes (100k by default),
+exports it to plain and gzip-compressed JSON Lines, imports each export
+into a fresh store and reports notes per second and peak memory. Peak
+memory should stay flat as the note count grows on export; on import it
+grows only by the in-memory note metadata. Memory tracing slows Python
+down, so the rates shown are lower bounds.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.notes_manager import NotesManager
+
+WORDS = "meeting notes project deadline review draft idea todo follow up budget plan".split()
+
+
+def make_notes(count):
+    """Yield (content, title) pairs of a few hundred bytes each"""
+    for i in range(count):
+        words = [WORDS[(i * 7 + j) % len(WORDS)] for j in range(40)]
+        yield " ".join(words) + f" #{i}", f"Note {i}"
+
+
+def timed(label, count, func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<14}: {elapsed:7.2f}s  {count / elapsed:9.0f} notes/s  peak {peak / 1024 ** 2:6.1f} MB")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = NotesManager(tmp / "source")
+        batch = []
+        start = time.perf_counter()
+        for note in make_notes(count):
+            batch.append(note)
+            if len(batch) == 1000:
+                source.save_notes(batch)
+                batch = []
+        source.save_notes(batch)
+        print(f"Saved {count} notes in {time.perf_counter() - start:.2f}s")
+
+        for name in ("notes.jsonl", "notes.jsonl.gz"):
+            path = str(tmp / name)
+            timed(f"export {name[6:]}", count, source.export_notes, path)
+            print(f"{'':<14}  {os.path.getsize(path) / 1024 ** 2:.1f} MB on disk")
+            target = NotesManager(tmp / f"target_{name}")
+            imported = timed(f"import {name[6:]}", count, target.import_notes, path)
+            assert imported == count, f"imported {imported} of {count}"
+
+
+if __name__ == "__main__":
+    main()
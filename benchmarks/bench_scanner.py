@@ -0,0 +1,92 @@
+"""
+Benchmark - os.walk + os.stat versus the parallel scandir scanner
+
+Usage:
+    python benchmarks/bench_scanner.py [folder] [max_depth]
+
+Without a folder argument a synthetic tree is generated in a temp directory.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.scanner import FileScanner
+
+
+def legacy_scan(folder_path, max_depth=3):
+    """The original walk-then-stat path (FileManager + scan_folder_auto)"""
+    files = []
+    for root, dirs, filenames in os.walk(folder_path):
+        depth = root.replace(folder_path, '').count(os.sep)
+        if depth > max_depth:
+            dirs.clear()
+            continue
+        for filename in filenames:
+            files.append(os.path.join(root, filename))
+
+    records = []
+    for file_path in files:
+        try:
+            st = os.stat(file_path)
+            records.append((file_path, st.st_size, st.st_mtime, os.path.splitext(file_path)[1]))
+        except OSError:
+            pass
+    return records
+
+
+def make_tree(base, dirs_per_level=8, levels=3, files_per_dir=40):
+    """Create a synthetic folder tree and return the number of files"""
+    count = 0
+    level_dirs = [base]
+    for _ in range(levels):
+        next_dirs = []
+        for parent in level_dirs:
+            for d in range(dirs_per_level):
+                path = os.path.join(parent, f"dir{d}")
+                os.mkdir(path)
+                next_dirs.append(path)
+                for f in range(files_per_dir):
+                    with open(os.path.join(path, f"file{f}.txt"), 'w') as fh:
+                        fh.write("x" * f)
+                    count += 1
+        level_dirs = next_dirs
+    return count
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    max_depth = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    if len(sys.argv) > 1:
+        folder = sys.argv[1]
+        tmp = None
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        folder = tmp.name
+        print(f"Generated {make_tree(folder)} files in {folder}")
+
+    try:
+        legacy_time, legacy = timed(legacy_scan, folder, max_depth)
+        print(f"os.walk + os.stat : {legacy_time:8.3f}s  {len(legacy)} files")
+
+        for workers in (1, 4, 16):
+            scanner = FileScanner(max_workers=workers)
+            scan_time, entries = timed(scanner.scan, folder, max_depth)
+            print(f"scandir x{workers:<2}       : {scan_time:8.3f}s  {len(entries)} files  "
+                  f"({legacy_time / scan_time:.1f}x)")
+    finally:
+        if tmp:
+            tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Directory Listing Cache - Subdirectory listings reused until a directory changes
+"""
+
+import os
+from collections import OrderedDict
+from typing import List, Tuple
+
+
+class DirListingCache:
+    """Subdirectories of a directory, cached by the directory's mtime.
+
+    Adding, removing or renaming an entry updates its directory's mtime,
+    so a cached listing is valid for as long as the mtime is unchanged and
+    checking it costs a single stat. The least recently used listings are
+    dropped beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._listings: "OrderedDict[str, Tuple[int, List[Tuple[str, str]]]]" = OrderedDict()
+
+    def subdirs(self, dir_path: str, include_hidden: bool = False) -> List[Tuple[str, str]]:
+        """Sorted (name, path) pairs of the subdirectories of dir_path"""
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return []
+
+        cached = self._listings.get(dir_path)
+        if cached is not None and cached[0] == mtime_ns:
+            self._listings.move_to_end(dir_path)
+            listing = cached[1]
+        else:
+            listing = []
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                listing.append((entry.name, entry.path))
+                        except OSError:
+                            continue
+            except OSError:
+                return []
+            listing.sort()
+            self._listings[dir_path] = (mtime_ns, listing)
+            self._listings.move_to_end(dir_path)
+            if len(self._listings) > self.max_entries:
+                self._listings.popitem(last=False)
+
+        if include_hidden:
+            return listing
+        return [(name, path) for name, path in listing if not name.startswith('.')]
@@ -0,0 +1,104 @@
+"""
+Disk Usage - Cumulative size and file count per directory
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class DiskUsage:
+    """Running totals of scanned files for every directory under a root.
+
+    Each directory's entry counts the files in it and in all of its
+    subdirectories. Files are added (or removed, with negative deltas)
+    per directory and the change is carried up the ancestor chain, so an
+    update costs one step per directory level instead of a recount of
+    the whole tree.
+    """
+
+    def __init__(self):
+        self.reset(None)
+
+    def reset(self, root: Optional[str]):
+        """Forget all totals and start counting under root"""
+        self.root = self._key(root) if root else None
+        # dir path (no trailing separator) -> [total bytes, total files]
+        self.totals: Dict[str, List[int]] = {}
+
+    @staticmethod
+    def _key(dir_path: str) -> str:
+        stripped = dir_path.rstrip("/" + os.sep)
+        # Keep drive and filesystem roots as they are
+        return stripped if stripped and not stripped.endswith(':') else dir_path
+
+    def add(self, dir_path: str, size: int, count: int):
+        """Add files directly in dir_path to it and to every ancestor up to the root"""
+        totals = self.totals
+        path = self._key(dir_path)
+        while True:
+            entry = totals.get(path)
+            if entry is None:
+                totals[path] = [size, count]
+            else:
+                entry[0] += size
+                entry[1] += count
+            if path == self.root:
+                break
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+
+    def add_records(self, store, records: Iterable[int]):
+        """Count FileStore records, one ancestor walk per directory"""
+        direct: Dict[int, List[int]] = {}
+        dir_ids, sizes = store.dir_ids, store.sizes
+        for i in records:
+            entry = direct.get(dir_ids[i])
+            if entry is None:
+                direct[dir_ids[i]] = [sizes[i], 1]
+            else:
+                entry[0] += sizes[i]
+                entry[1] += 1
+        for dir_id, (size, count) in direct.items():
+            self.add(store.dirs[dir_id], size, count)
+
+    def rebuild(self, store, root: str):
+        """Recompute every total in a single bottom-up pass over the store"""
+        self.reset(root)
+        per_dir = [[0, 0] for _ in store.dirs]
+        for dir_id, size, alive in zip(store.dir_ids, store.sizes, store.live):
+            if not alive:
+                continue
+            entry = per_dir[dir_id]
+            entry[0] += size
+            entry[1] += 1
+
+        # Bucket directories by depth and fold the deepest level into its
+        # parents first, so every directory is complete before it is added
+        levels: Dict[int, List[str]] = {}
+        totals = self.totals
+        for dir_path, entry in zip(store.dirs, per_dir):
+            key = self._key(dir_path)
+            totals[key] = entry
+            levels.setdefault(key.count(os.sep), []).append(key)
+
+        for depth in range(max(levels, default=0), -1, -1):
+            for path in levels.get(depth, ()):
+                if path == self.root:
+                    continue
+                parent = os.path.dirname(path)
+                if parent == path:
+                    continue
+                entry = totals.get(parent)
+                if entry is None:
+                    entry = totals[parent] = [0, 0]
+                    levels.setdefault(depth - 1, []).append(parent)
+                size, count = totals[path]
+                entry[0] += size
+                entry[1] += count
+
+    def usage(self, dir_path: str) -> Tuple[int, int]:
+        """Total bytes and files at or below dir_path"""
+        entry = self.totals.get(self._key(dir_path))
+        return (entry[0], entry[1]) if entry else (0, 0)
@@ -0,0 +1,195 @@
+"""
+Duplicate Finder - Staged size, partial hash and full hash comparison
+"""
+
+import hashlib
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.hash_cache import HashCache
+
+
+# Bytes hashed from each end of a file before committing to a full read
+EDGE_SIZE = 64 * 1024
+# Read size for full hashes; memory per file never exceeds one chunk
+CHUNK_SIZE = 1024 * 1024
+
+
+def edge_hash(path: str, size: int) -> bytes:
+    """Hash the first and last EDGE_SIZE bytes of a file.
+
+    Files no longer than two edges are hashed whole, so for them this
+    is already the full hash.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if size <= 2 * EDGE_SIZE:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(EDGE_SIZE))
+            f.seek(-EDGE_SIZE, os.SEEK_END)
+            digest.update(f.read(EDGE_SIZE))
+    return digest.digest()
+
+
+def full_hash(path: str) -> bytes:
+    """Hash a whole file, streaming it through a fixed-size buffer"""
+    digest = hashlib.blake2b()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.digest()
+
+
+class HashPool:
+    """Hash files on a pool of threads.
+
+    File reads and BLAKE2 both release the GIL, so threads hash in
+    parallel. Jobs are only started while the bytes they will read, added
+    to those already being read, stay under max_inflight_bytes, which
+    keeps a spinning disk from seeking between dozens of large files.
+    progress(stage, done, total) is called after every file, on the
+    thread that called hash_all. With a HashCache, files unchanged since
+    they were last hashed are not read at all.
+    """
+
+    def __init__(self, workers: int = 1, max_inflight_bytes: int = 64 * 1024 * 1024,
+                 progress: Optional[Callable[[str, int, int], None]] = None,
+                 cache: Optional[HashCache] = None):
+        self.workers = max(1, workers)
+        self.max_inflight_bytes = max_inflight_bytes
+        self.progress = progress
+        self.cache = cache
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop starting new jobs; the running ones are waited for"""
+        self.cancelled = True
+
+    def hash_all(self, stage: str, items: List[Tuple[str, int]],
+                 hash_func: Callable[[str, int], bytes],
+                 cost: Callable[[int], int]) -> Dict[Tuple[str, int], bytes]:
+        """Hash (path, size) items, skipping unreadable files.
+
+        cost maps a file size to the number of bytes hash_func reads.
+        """
+        if self.cache is None:
+            return self._hash(stage, items, hash_func, cost, 0, len(items))
+
+        # Small files are read about as fast as their cache entry is checked
+        min_size = self.cache.min_size
+        cached, keys = self.cache.lookup(stage, [item for item in items if item[1] >= min_size])
+        missing = [item for item in items if item[1] < min_size or (item in keys and item not in cached)]
+        self._report(stage, len(cached), len(items))
+        results = self._hash(stage, missing, hash_func, cost, len(cached), len(items))
+        if not self.cancelled:
+            self.cache.store(stage, {item: (keys[item], digest) for item, digest in results.items() if item in keys}, cached)
+        results.update(cached)
+        return results
+
+    def _hash(self, stage, items, hash_func, cost, done, total):
+        results = {}
+        if self.workers == 1:
+            for done, item in enumerate(items, done + 1):
+                if self.cancelled:
+                    break
+                digest = _try_hash(hash_func, item)[1]
+                if digest is not None:
+                    results[item] = digest
+                self._report(stage, done, total)
+            return results
+
+        finished = queue.SimpleQueue()
+        pending = iter(items)
+        item = next(pending, None)
+        running = inflight = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while running or (item is not None and not self.cancelled):
+                # Always allow one job so a file larger than the cap still runs
+                while (item is not None and not self.cancelled and running < self.workers
+                       and (not running or inflight + cost(item[1]) <= self.max_inflight_bytes)):
+                    future = pool.submit(_try_hash, hash_func, item)
+                    future.add_done_callback(finished.put)
+                    running += 1
+                    inflight += cost(item[1])
+                    item = next(pending, None)
+
+                hashed, digest = finished.get().result()
+                running -= 1
+                inflight -= cost(hashed[1])
+                done += 1
+                if digest is not None:
+                    results[hashed] = digest
+                self._report(stage, done, total)
+        return results
+
+    def _report(self, stage, done, total):
+        if self.progress is not None:
+            self.progress(stage, done, total)
+
+
+def _try_hash(hash_func, item):
+    try:
+        return item, hash_func(*item)
+    except OSError:
+        return item, None
+
+
+def _edge_cost(size: int) -> int:
+    return min(size, 2 * EDGE_SIZE)
+
+
+def _full_hash(path: str, size: int) -> bytes:
+    return full_hash(path)
+
+
+def _full_cost(size: int) -> int:
+    return size
+
+
+def _collisions(hashes: Dict[Tuple[str, int], bytes]) -> List[List[Tuple[str, int]]]:
+    """Group hashed items by (size, digest), keeping groups of two or more"""
+    groups: Dict[Tuple[int, bytes], List[Tuple[str, int]]] = {}
+    for item, digest in hashes.items():
+        groups.setdefault((item[1], digest), []).append(item)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_duplicates(files: Iterable[Tuple[str, int]], pool: HashPool = None) -> Dict[str, List[str]]:
+    """Group identical files, given as (path, size) pairs.
+
+    Each stage only looks at files that collided in the previous one:
+    files with a unique size are never opened, and files whose ends
+    differ are never read in full. Returns a content hash hex digest ->
+    paths, for groups of two or more, or an empty dict if the pool was
+    cancelled.
+    """
+    pool = pool or HashPool()
+    by_size: Dict[int, List[Tuple[str, int]]] = {}
+    for path, size in files:
+        # Empty files are trivially identical and not worth reporting
+        if size > 0:
+            by_size.setdefault(size, []).append((path, size))
+    candidates = [item for group in by_size.values() if len(group) > 1 for item in group]
+
+    edge_hashes = pool.hash_all("partial", candidates, edge_hash, _edge_cost)
+    duplicates = {}
+    full_candidates = []
+    for group in _collisions(edge_hashes):
+        if group[0][1] <= 2 * EDGE_SIZE:
+            # The edge hash already covered the whole file
+            duplicates[edge_hashes[group[0]].hex()] = [path for path, _ in group]
+        else:
+            full_candidates.extend(group)
+
+    full_hashes = pool.hash_all("full", full_candidates, _full_hash, _full_cost)
+    for group in _collisions(full_hashes):
+        duplicates[full_hashes[group[0]].hex()] = [path for path, _ in group]
+    return {} if pool.cancelled else duplicates
@@ -0,0 +1,99 @@
+"""
+File Filter - Incremental substring filtering over file names
+"""
+
+from array import array
+from typing import Callable, Dict, Iterable, Optional
+
+
+class FileFilter:
+    """Case-insensitive name filter over FileStore records.
+
+    Lowercased names are computed once as records are added. A query that
+    contains the previous query can only match a subset of its results, so
+    it narrows that result instead of rescanning every name. An optional
+    trigram index narrows fresh queries of three or more characters to the
+    records containing all of their trigrams before any name is compared.
+    """
+
+    def __init__(self, store, trigrams: bool = False):
+        self.store = store
+        self.use_trigrams = trigrams
+        self.clear()
+
+    def clear(self):
+        """Forget all records"""
+        self.names_lower = []
+        self.trigrams: Dict[str, array] = {}
+        self._last = None
+
+    def add(self, records: Iterable[int]):
+        """Index records appended to the store"""
+        names = self.store.names
+        names_lower = self.names_lower
+        for i in records:
+            name = names[i].lower()
+            names_lower.append(name)
+            if self.use_trigrams:
+                for gram in {name[j:j + 3] for j in range(len(name) - 2)}:
+                    postings = self.trigrams.get(gram)
+                    if postings is None:
+                        postings = self.trigrams[gram] = array('i')
+                    postings.append(i)
+
+    def match(self, text: str, records: Iterable[int]) -> array:
+        """Records whose name contains text, in the order given"""
+        if not text:
+            return array('l', records)
+        names_lower = self.names_lower
+        return array('l', [i for i in records if text in names_lower[i]])
+
+    def query(self, text: str, base: array, order: Callable = None) -> array:
+        """Records of base whose name contains text, in base order.
+
+        Results are reused while base is unchanged, so typing more of a
+        query only re-checks what the previous keystroke matched. When
+        base is not in record order, order must put a list of records
+        into base order; it is only applied to trigram candidates.
+        """
+        text = text.lower()
+        if not text:
+            return base
+
+        last = self._last
+        if last and last[1] is base and last[2] == len(base) and last[0] in text:
+            result = self.match(text, last[3])
+        else:
+            candidates = self._trigram_candidates(text, len(base))
+            if candidates is None:
+                result = self.match(text, base)
+            else:
+                result = self.match(text, candidates)
+                if order is not None:
+                    result = array('l', order(result))
+
+        self._last = (text, base, len(base), result)
+        return result
+
+    def _trigram_candidates(self, text: str, total: int) -> Optional[list]:
+        if not self.use_trigrams or len(text) < 3:
+            return None
+
+        postings = []
+        for gram in {text[j:j + 3] for j in range(len(text) - 2)}:
+            found = self.trigrams.get(gram)
+            if not found:
+                return []
+            postings.append(found)
+        postings.sort(key=len)
+
+        # Intersect starting from the rarest trigram; a broad query is
+        # cheaper to answer with a plain scan
+        candidates = set(postings[0])
+        for found in postings[1:]:
+            candidates.intersection_update(found)
+        if len(candidates) * 8 >= total:
+            return None
+        # Postings are never pruned, so drop records removed since
+        live = self.store.live
+        return [i for i in sorted(candidates) if live[i]]
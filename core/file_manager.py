@@ -4,16 +4,39 @@ File Manager - Handle file operations and scanning
 
 import os
 import json
+import time
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+
+from core.scanner import FileScanner, ScanEntry
+from core.scan_index import ScanIndex
+from core.file_store import FileStore
+from core.duplicates import HashPool, find_duplicates
+from core.hash_cache import HashCache
+from core.organizer import MovePlan, MoveResult, PlanExecutor, build_plan
+from core.move_journal import MoveJournal
+from core.dir_listing import DirListingCache
+from core.disk_usage import DiskUsage
+from core.recent_files import RecentFiles
+from core.file_stats import Categorizer, FileStats
+from core.metrics import MetricsCube
+from core.watcher import DirChange, FolderWatcher
 
 
 class FileManager:
     def __init__(self):
-        self.files_cache = []
+        self.store = FileStore()
+        self.scanner = FileScanner()
+        self.scan_index = ScanIndex()
+        self.journal = MoveJournal()
+        self.dir_listings = DirListingCache()
+        self.disk_usage = DiskUsage()
+        self.recent = RecentFiles()
         self.config_file = Path.home() / ".workspace_organizer" / "config.json"
         self.load_config()
+        self.categorizer = Categorizer(self.config.get('categories'))
+        self.metrics = MetricsCube(self.categorizer)
+        self.hash_cache = HashCache(max_entries=self.config.get('hash_cache_max_entries', 500_000))
     
     def load_config(self):
         """Load configuration"""
@@ -29,190 +52,221 @@ class FileManager:
         with open(self.config_file, 'w') as f:
             json.dump(self.config, f, indent=2)
     
+    @property
+    def files_cache(self) -> List[str]:
+        """Paths of all scanned files"""
+        return list(self.store.iter_paths())
+    
+    def iter_scan(self, folder_path: str, max_depth: int = 3) -> Iterator[List[ScanEntry]]:
+        """Scan folder, yielding each directory's files as they are listed.
+        
+        The batches are not added to the store, so this can run on a worker
+        thread while the caller feeds them to add_entries on its own.
+        """
+        return self.scanner.iter_scan(folder_path, max_depth, self.scan_index)
+    
+    def list_subfolders(self, folder_path: str) -> List[Tuple[str, str]]:
+        """Visible subfolders of a folder as sorted (name, path) pairs"""
+        return self.dir_listings.subdirs(folder_path)
+    
+    def clear_store(self, folder_path: str):
+        """Drop scanned files before scanning folder_path"""
+        self.store.clear()
+        self.disk_usage.reset(folder_path)
+        self.recent.clear()
+        self.metrics.reset(folder_path)
+    
+    def add_entries(self, entries: List[ScanEntry]) -> range:
+        """Add scanned files to the store and to the folder totals"""
+        records = self.store.append(entries)
+        self.disk_usage.add_records(self.store, records)
+        self.recent.add_records(self.store, records)
+        self.metrics.add_records(self.store, records)
+        return records
+    
+    def watch(self, folder_path: str, max_depth: int = 3) -> FolderWatcher:
+        """Watcher over the directories the last scan of folder_path listed"""
+        watcher = FolderWatcher(folder_path, max_depth)
+        watcher.watch(self.scan_index.load(folder_path))
+        return watcher
+    
+    def record_changes(self, changes: List[DirChange]):
+        """Store re-listed directories in the scan index; safe on a worker thread"""
+        self.scan_index.save(
+            {c.path: (c.mtime_ns, c.files, c.subdirs) for c in changes if c.files is not None},
+            [c.path for c in changes if c.files is None]
+        )
+    
+    def apply_changes(self, changes: List[DirChange]) -> Tuple[List[int], range]:
+        """Bring the store up to date with re-listed directories.
+        
+        Files whose size and mtime are unchanged keep their records; new
+        and modified files get new records and vanished or modified ones
+        are removed. Returns the removed and added records.
+        """
+        store = self.store
+        current = store.dir_records([c.path for c in changes])
+        removed = []
+        entries = []
+        for change in changes:
+            old = current[change.path]
+            if change.files is None:
+                removed.extend(old)
+                continue
+            by_name = {store.names[i]: i for i in old}
+            for entry in change.files:
+                i = by_name.pop(entry.path.rpartition(os.sep)[2], None)
+                if i is not None:
+                    if store.sizes[i] == entry.size and store.mtimes[i] == entry.mtime:
+                        continue
+                    removed.append(i)
+                entries.append(entry)
+            removed.extend(by_name.values())
+        
+        # Take sizes out of the folder totals before the store zeroes them
+        deltas = {}
+        for i in removed:
+            delta = deltas.setdefault(store.dir_ids[i], [0, 0])
+            delta[0] -= store.sizes[i]
+            delta[1] -= 1
+        for dir_id, (size, count) in deltas.items():
+            self.disk_usage.add(store.dirs[dir_id], size, count)
+        self.metrics.remove_records(store, removed)
+        store.remove(removed)
+        self.recent.remove(removed)
+        return removed, self.add_entries(entries)
+    
     def scan_folder(self, folder_path: str, max_depth: int = 3) -> List[str]:
         """Scan folder for all files"""
-        files = []
         try:
-            for root, dirs, filenames in os.walk(folder_path):
-                depth = root.replace(folder_path, '').count(os.sep)
-                if depth > max_depth:
-                    dirs.clear()
-                    continue
-                
-                for filename in filenames:
-                    file_path = os.path.join(root, filename)
-                    files.append(file_path)
-            
-            self.files_cache = files
-            return files
+            self.store.clear()
+            for batch in self.iter_scan(folder_path, max_depth):
+                self.store.append(batch)
+            self.disk_usage.rebuild(self.store, folder_path)
+            self.recent.rebuild(self.store)
+            self.metrics.rebuild(self.store, folder_path)
+            return self.files_cache
         except Exception as e:
             print(f"Error scanning folder: {e}")
             return []
     
     def get_recent_files(self, limit: int = 20) -> List[str]:
-        """Get recently modified files"""
-        if not self.files_cache:
-            return []
-        
-        try:
-            recent = sorted(
-                self.files_cache,
-                key=lambda x: os.path.getmtime(x),
-                reverse=True
-            )
-            return recent[:limit]
-        except:
-            return self.files_cache[:limit]
+        """Paths of the most recently modified scanned files, newest first"""
+        store = self.store
+        return [store.path(i) for i in self.recent.top(store, limit)]
     
     def get_total_storage(self) -> str:
         """Get total storage size"""
-        if not self.files_cache:
-            return "0 B"
+        total_size = self.store.total_size()
+        for unit in ['B', 'KB', 'MB', 'GB']:
+            if total_size < 1024:
+                return f"{total_size:.1f} {unit}"
+            total_size /= 1024
         
-        try:
-            total_size = sum(
-                os.path.getsize(f) for f in self.files_cache
-                if os.path.exists(f)
-            )
-            
-            for unit in ['B', 'KB', 'MB', 'GB']:
-                if total_size < 1024:
-                    return f"{total_size:.1f} {unit}"
-                total_size /= 1024
-            
-            return f"{total_size:.1f} TB"
-        except:
-            return "Unknown"
+        return f"{total_size:.1f} TB"
+    
+    def file_stats(self) -> FileStats:
+        """Category and extension breakdown of the scanned files"""
+        return self.categorizer.aggregate(self.store)
     
     def categorize_files(self) -> Dict[str, List[str]]:
-        """Categorize files by type"""
-        categories = {
-            'Documents': [],
-            'Images': [],
-            'Videos': [],
-            'Audio': [],
-            'Archives': [],
-            'Other': []
+        """Categorize files by type, using the 'categories' map from the config"""
+        store = self.store
+        return {
+            category: [store.path(i) for i in records]
+            for category, records in self.file_stats().categories.items()
         }
-        
-        doc_ext = {'.pdf', '.doc', '.docx', '.txt', '.xlsx', '.xls', '.ppt', '.pptx'}
-        img_ext = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.ico'}
-        video_ext = {'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv'}
-        audio_ext = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a'}
-        arch_ext = {'.zip', '.rar', '.7z', '.tar', '.gz', '.bz2'}
-        
-        for file_path in self.files_cache:
-            ext = Path(file_path).suffix.lower()
-            
-            if ext in doc_ext:
-                categories['Documents'].append(file_path)
-            elif ext in img_ext:
-                categories['Images'].append(file_path)
-            elif ext in video_ext:
-                categories['Videos'].append(file_path)
-            elif ext in audio_ext:
-                categories['Audio'].append(file_path)
-            elif ext in arch_ext:
-                categories['Archives'].append(file_path)
-            else:
-                categories['Other'].append(file_path)
-        
-        return categories
     
     def search_files(self, query: str) -> List[str]:
         """Search files by name"""
         query = query.lower()
         return [f for f in self.files_cache if query in Path(f).name.lower()]
     
-    def organize_by_type(self, folder_path: str) -> int:
-        """Organize files into folders by type"""
-        organized_count = 0
-        categorized = self.categorize_files()
-        
-        base_path = Path(folder_path)
+    def plan_organize_by_type(self, folder_path: str) -> MovePlan:
+        """Plan moving scanned files into a folder per type"""
+        return build_plan(
+            (file_path, os.path.join(folder_path, category))
+            for category, files in self.categorize_files().items()
+            for file_path in files
+        )
+    
+    def plan_organize_by_date(self, folder_path: str) -> MovePlan:
+        """Plan moving scanned files into YYYY/MM/DD folders by modification date"""
+        store = self.store
+        day_dirs = {}
         
-        for category, files in categorized.items():
-            if not files:
-                continue
-            
-            # Create category folder
-            category_folder = base_path / category
-            category_folder.mkdir(exist_ok=True)
-            
-            # Move files
-            for file_path in files:
-                try:
-                    file_obj = Path(file_path)
-                    if file_obj.parent != category_folder:
-                        shutil.move(str(file_obj), str(category_folder / file_obj.name))
-                        organized_count += 1
-                except:
-                    pass
+        def targets():
+            for i in store.records():
+                day = time.localtime(store.mtimes[i])[:3]
+                date_folder = day_dirs.get(day)
+                if date_folder is None:
+                    date_folder = day_dirs[day] = os.path.join(
+                        folder_path, str(day[0]), f"{day[1]:02d}", f"{day[2]:02d}"
+                    )
+                yield store.path(i), date_folder
         
-        return organized_count
+        return build_plan(targets())
+    
+    def plan_executor(self, progress: Callable[[int, int], None] = None) -> PlanExecutor:
+        """Organize executor sized from the config"""
+        return PlanExecutor(
+            rename_workers=self.config.get('organize_workers', 8),
+            copy_workers=self.config.get('organize_copy_workers', 1),
+            progress=progress
+        )
+    
+    def execute_plan(self, plan: MovePlan, folder_path: str, label: str,
+                     executor: PlanExecutor = None) -> MoveResult:
+        """Carry out an organize plan, journaling every move for undo"""
+        with self.journal.begin(folder_path, label, plan.dirs) as journal:
+            return (executor or self.plan_executor()).execute(plan, journal)
+    
+    def last_organize(self) -> Optional[dict]:
+        """The most recent organize run that can still be undone"""
+        return self.journal.latest()
+    
+    def undo_organize(self, run: dict, progress: Callable[[int, int], None] = None) -> MoveResult:
+        """Move the files of an organize run back where they came from"""
+        return self.journal.undo(run['path'], progress)
+    
+    def organize_by_type(self, folder_path: str) -> int:
+        """Organize files into folders by type"""
+        return self.execute_plan(self.plan_organize_by_type(folder_path), folder_path, "type").moved
     
     def organize_by_date(self, folder_path: str) -> int:
         """Organize files into folders by date"""
-        organized_count = 0
-        base_path = Path(folder_path)
-        
-        for file_path in self.files_cache:
-            try:
-                file_obj = Path(file_path)
-                mod_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                
-                # Create date folder (YYYY/MM/DD)
-                date_folder = base_path / str(mod_time.year) / f"{mod_time.month:02d}" / f"{mod_time.day:02d}"
-                date_folder.mkdir(parents=True, exist_ok=True)
-                
-                if file_obj.parent != date_folder:
-                    shutil.move(str(file_obj), str(date_folder / file_obj.name))
-                    organized_count += 1
-            except:
-                pass
-        
-        return organized_count
+        return self.execute_plan(self.plan_organize_by_date(folder_path), folder_path, "date").moved
     
-    def find_duplicates(self, files: List[str]) -> Dict[str, List[str]]:
-        """Find duplicate files by size and hash"""
-        import hashlib
-        
-        duplicates = {}
-        size_map = {}
-        
-        # Group by size first
-        for file_path in files:
-            try:
-                size = os.path.getsize(file_path)
-                if size not in size_map:
-                    size_map[size] = []
-                size_map[size].append(file_path)
-            except:
-                pass
+    def sized_files(self) -> List[Tuple[str, int]]:
+        """Snapshot of scanned files as (path, size) pairs"""
+        store = self.store
+        return [(store.path(i), store.sizes[i]) for i in store.records()]
+    
+    def hash_pool(self, progress: Callable[[str, int, int], None] = None) -> HashPool:
+        """Hashing pool sized from the config"""
+        return HashPool(
+            workers=self.config.get('hash_workers', min(4, os.cpu_count() or 1)),
+            max_inflight_bytes=self.config.get('hash_inflight_mb', 64) * 1024 * 1024,
+            progress=progress,
+            cache=self.hash_cache
+        )
+    
+    def find_duplicates(self, files: List[str] = None, pool: HashPool = None) -> Dict[str, List[str]]:
+        """Find duplicate files by size and hash.
         
-        # Check files with same size for hash
-        for size, file_list in size_map.items():
-            if len(file_list) < 2:
-                continue
-            
-            hash_map = {}
-            for file_path in file_list:
+        Defaults to the scanned files, whose sizes are already known.
+        """
+        if files is None:
+            candidates = self.sized_files()
+        else:
+            candidates = []
+            for file_path in files:
                 try:
-                    with open(file_path, 'rb') as f:
-                        file_hash = hashlib.md5(f.read()).hexdigest()
-                    
-                    if file_hash not in hash_map:
-                        hash_map[file_hash] = []
-                    hash_map[file_hash].append(file_path)
-                except:
+                    candidates.append((file_path, os.path.getsize(file_path)))
+                except OSError:
                     pass
-            
-            # Store duplicates
-            for file_hash, dup_list in hash_map.items():
-                if len(dup_list) > 1:
-                    duplicates[file_hash] = dup_list
         
-        return duplicates
+        return find_duplicates(candidates, pool or self.hash_pool())
     
     def cleanup_empty_folders(self, folder_path: str) -> int:
         """Remove empty folders"""
@@ -0,0 +1,92 @@
+"""
+File Stats - Categories, extension counts and totals in one pass over the store
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+DEFAULT_CATEGORIES = {
+    'Documents': ['.pdf', '.doc', '.docx', '.txt', '.xlsx', '.xls', '.ppt', '.pptx'],
+    'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.ico'],
+    'Videos': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv'],
+    'Audio': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a'],
+    'Archives': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2'],
+}
+
+OTHER = 'Other'
+
+
+class FileStats(NamedTuple):
+    """Aggregates of the live records of a FileStore"""
+    file_count: int
+    total_size: int
+    categories: Dict[str, List[int]]  # category -> records, every category present
+    category_counts: Dict[str, int]
+    category_sizes: Dict[str, int]
+    extensions: Dict[str, List[int]]  # lower-case extension -> [files, bytes]
+
+
+class Categorizer:
+    """Maps file extensions to categories.
+
+    The map is {category: [extensions]}, matched case-insensitively. An
+    extension listed under several categories belongs to the first, and
+    anything unlisted is Other.
+    """
+
+    def __init__(self, category_map: Optional[Dict[str, List[str]]] = None):
+        category_map = category_map or DEFAULT_CATEGORIES
+        self.names = [name for name in category_map if name != OTHER] + [OTHER]
+        self._by_ext: Dict[str, str] = {}
+        for name, extensions in category_map.items():
+            for ext in extensions:
+                ext = ext.lower()
+                if not ext.startswith('.'):
+                    ext = '.' + ext
+                self._by_ext.setdefault(ext, name)
+
+    def category(self, ext: str) -> str:
+        """Category of an extension such as '.PDF'"""
+        return self._by_ext.get(ext.lower(), OTHER)
+
+    def aggregate(self, store) -> FileStats:
+        """Group every live record of store by extension, then fold into categories.
+
+        The pass over the records only touches the extension id and size
+        columns; names are never looked at and categories are resolved
+        once per distinct extension rather than once per file.
+        """
+        ext_count = len(store.ext_names)
+        by_ext: List[List[int]] = [[] for _ in range(ext_count)]
+        bytes_by_ext = [0] * ext_count
+        rows = zip(store.ext_ids, store.sizes)
+        if store.removed:
+            rows = (row if alive else None for row, alive in zip(rows, store.live))
+        for i, row in enumerate(rows):
+            if row is not None:
+                ext_id, size = row
+                by_ext[ext_id].append(i)
+                bytes_by_ext[ext_id] += size
+
+        categories = {name: [] for name in self.names}
+        category_sizes = dict.fromkeys(self.names, 0)
+        extensions: Dict[str, List[int]] = {}
+        for ext_id, records in enumerate(by_ext):
+            if not records:
+                continue
+            ext = store.ext_names[ext_id].lower()
+            name = self.category(ext)
+            categories[name].extend(records)
+            category_sizes[name] += bytes_by_ext[ext_id]
+            entry = extensions.setdefault(ext, [0, 0])
+            entry[0] += len(records)
+            entry[1] += bytes_by_ext[ext_id]
+
+        category_counts = {name: len(records) for name, records in categories.items()}
+        return FileStats(
+            file_count=sum(category_counts.values()),
+            total_size=sum(category_sizes.values()),
+            categories=categories,
+            category_counts=category_counts,
+            category_sizes=category_sizes,
+            extensions=extensions
+        )
@@ -0,0 +1,136 @@
+"""
+File Store - Compact columnar storage for scanned files
+"""
+
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List
+
+from core.scanner import ScanEntry
+
+
+class FileStore:
+    """Scanned files kept as parallel columns instead of per-file objects.
+
+    Sizes and mtimes are raw numbers in typed arrays, directories and
+    extensions are stored once and referenced by index, so a file costs
+    its name plus a few fixed-width fields. Record i is described by
+    dirs[dir_ids[i]] + names[i], sizes[i], mtimes[i] and
+    ext_names[ext_ids[i]]. Formatting is left to whoever displays it.
+
+    Records are never renumbered, since views and indexes refer to them
+    by index. Removing a record marks it dead in the live column and
+    zeroes its size; records() and iter_paths() skip dead records. Each
+    directory also keeps the records filed under it, so one directory's
+    files are found without a pass over the whole store.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Remove all records"""
+        self.dirs = []
+        self.dir_rows: List[array] = []
+        self.names = []
+        self.ext_names = []
+        self.dir_ids = array('i')
+        self.ext_ids = array('i')
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.live = bytearray()
+        self.removed = 0
+        self._dir_index = {}
+        self._ext_index = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def append(self, entries: Iterable[ScanEntry]) -> range:
+        """Add scan entries and return the indices they were stored at"""
+        start = len(self.names)
+        dir_index = self._dir_index
+        ext_index = self._ext_index
+        dir_rows = self.dir_rows
+        sep = os.sep
+
+        for i, (path, size, mtime, ext) in enumerate(entries, start):
+            # Keep the separator on the directory so paths rebuild by
+            # concatenation, including for files directly under a drive root
+            head, _, name = path.rpartition(sep)
+            head += sep
+            dir_id = dir_index.get(head)
+            if dir_id is None:
+                dir_id = dir_index[head] = len(self.dirs)
+                self.dirs.append(head)
+                dir_rows.append(array('i'))
+            ext_id = ext_index.get(ext)
+            if ext_id is None:
+                ext_id = ext_index[ext] = len(self.ext_names)
+                self.ext_names.append(ext)
+
+            self.names.append(name)
+            self.dir_ids.append(dir_id)
+            self.ext_ids.append(ext_id)
+            self.sizes.append(size)
+            self.mtimes.append(mtime)
+            dir_rows[dir_id].append(i)
+
+        self.live.extend(b'\x01' * (len(self.names) - start))
+        return range(start, len(self.names))
+
+    def remove(self, records: Iterable[int]):
+        """Mark records as deleted"""
+        live, sizes = self.live, self.sizes
+        for i in records:
+            if live[i]:
+                live[i] = 0
+                sizes[i] = 0
+                self.removed += 1
+
+    @property
+    def file_count(self) -> int:
+        """Number of live records"""
+        return len(self.names) - self.removed
+
+    def records(self) -> Iterator[int]:
+        """Indices of live records"""
+        if not self.removed:
+            return iter(range(len(self.names)))
+        return (i for i, alive in enumerate(self.live) if alive)
+
+    def dir_records(self, dir_paths: Iterable[str]) -> Dict[str, List[int]]:
+        """Live records directly in each of dir_paths"""
+        live = self.live
+        found = {}
+        for dir_path in dir_paths:
+            dir_id = self._dir_index.get(os.path.join(dir_path, ''))
+            if dir_id is None:
+                found[dir_path] = []
+                continue
+            rows = self.dir_rows[dir_id]
+            records = [i for i in rows if live[i]]
+            if len(records) < len(rows):
+                # Drop removed records so changes to a busy folder stay cheap
+                self.dir_rows[dir_id] = array('i', records)
+            found[dir_path] = records
+        return found
+
+    def path(self, i: int) -> str:
+        """Full path of record i"""
+        return self.dirs[self.dir_ids[i]] + self.names[i]
+
+    def ext(self, i: int) -> str:
+        """Extension of record i, as found on disk"""
+        return self.ext_names[self.ext_ids[i]]
+
+    def iter_paths(self) -> Iterator[str]:
+        """Iterate over every live path"""
+        dirs = self.dirs
+        if not self.removed:
+            return (dirs[d] + name for d, name in zip(self.dir_ids, self.names))
+        return (dirs[d] + name for d, name, alive in zip(self.dir_ids, self.names, self.live) if alive)
+
+    def total_size(self) -> int:
+        """Total size of all records in bytes"""
+        return sum(self.sizes)
@@ -0,0 +1,137 @@
+"""
+Hash Cache - Persistent file digests keyed by path, size, mtime and inode
+"""
+
+import os
+import time
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+
+# Files modified this recently may still be being written; their digests
+# are not kept
+RACY_WINDOW_NS = 2 * 10**9
+
+# Paths per lookup query, below SQLite's bound parameter limit
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (path, stage)
+);
+CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes (last_used);
+"""
+
+# (path, size) as passed around by the duplicate finder
+Item = Tuple[str, int]
+# (size, mtime_ns, inode) a digest is valid for
+FileKey = Tuple[int, int, int]
+
+
+class HashCache:
+    """SQLite store of file digests under ~/.workspace_organizer/.
+
+    A digest is reused only while the file's size, mtime and inode all
+    match the ones it was computed for, so edits and replaced files are
+    re-hashed. Entries are stamped when used and the least recently used
+    ones are evicted once the cache holds more than max_entries. Files
+    smaller than min_size are left to the caller to hash directly.
+    """
+
+    def __init__(self, db_path: Path = None, max_entries: int = 500_000, min_size: int = 1024 * 1024):
+        self.db_path = db_path or Path.home() / ".workspace_organizer" / "hash_cache.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.min_size = min_size
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the cache usable from worker threads
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, stage: str, items: List[Item]) -> Tuple[Dict[Item, bytes], Dict[Item, FileKey]]:
+        """Stat items and find their cached digests.
+
+        Returns the digests still valid, and the current key of every file
+        that could be stat'ed; files missing from the second dict are gone.
+        """
+        keys = {}
+        for item in items:
+            try:
+                st = os.stat(item[0])
+            except OSError:
+                continue
+            keys[item] = (st.st_size, st.st_mtime_ns, st.st_ino)
+
+        hits = {}
+        by_path = {item[0]: item for item in keys}
+        paths = list(by_path)
+        try:
+            with self._connect() as conn:
+                for start in range(0, len(paths), LOOKUP_CHUNK):
+                    chunk = paths[start:start + LOOKUP_CHUNK]
+                    rows = conn.execute(
+                        "SELECT path, size, mtime_ns, inode, digest FROM hashes "
+                        f"WHERE stage = ? AND path IN ({','.join('?' * len(chunk))})",
+                        (stage, *chunk)
+                    )
+                    for path, size, mtime_ns, inode, digest in rows:
+                        item = by_path[path]
+                        if keys[item] == (size, mtime_ns, inode):
+                            hits[item] = digest
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read hash cache: {e}")
+        return hits, keys
+
+    def store(self, stage: str, digests: Dict[Item, Tuple[FileKey, bytes]], used: Iterable[Item] = ()):
+        """Save new digests, mark reused ones as recently used, then evict"""
+        now = time.time_ns()
+        racy_before = now - RACY_WINDOW_NS
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "UPDATE hashes SET last_used = ? WHERE path = ? AND stage = ?",
+                    ((now, path, stage) for path, _ in used)
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO hashes "
+                    "(path, stage, size, mtime_ns, inode, digest, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (path, stage, size, mtime_ns, inode, digest, now)
+                        for (path, _), ((size, mtime_ns, inode), digest) in digests.items()
+                        if mtime_ns <= racy_before
+                    )
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not save hash cache: {e}")
+
+    def _evict(self, conn):
+        (count,) = conn.execute("SELECT COUNT(*) FROM hashes").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM hashes WHERE rowid IN "
+                "(SELECT rowid FROM hashes ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def clear(self):
+        """Forget every stored digest"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM hashes")
@@ -0,0 +1,156 @@
+"""
+Metrics - File counts and sizes by category, extension, age and depth
+"""
+
+import os
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.file_stats import Categorizer
+
+# Local UTC offsets are whole quarter hours, so no such slot straddles a
+# local midnight and one lookup serves every mtime inside it
+SLOT = 900
+
+# (maximum age in days, label), youngest first; anything older is the last label
+AGE_BUCKETS = [
+    (1, 'Today'),
+    (7, 'This week'),
+    (30, 'This month'),
+    (365, 'This year'),
+]
+OLDER = 'Older'
+
+DIMENSIONS = ('category', 'extension', 'age', 'depth')
+
+
+class MetricsCube:
+    """Files and bytes of a FileStore, grouped by extension, mtime day and depth.
+
+    Each cell of the cube is keyed by (extension id, day of modification,
+    directory depth below the root) and holds [files, bytes], so it has
+    one cell per combination that actually occurs rather than one entry
+    per file. Records are added and removed as the scan and the watcher
+    report them, and breakdown() rolls the cells up along a single
+    dimension. Days are local calendar days, so "Today" starts at the
+    user's midnight rather than UTC's. Categories follow from extensions and age buckets from days
+    at query time, so the cube does not go stale as time passes.
+    """
+
+    def __init__(self, categorizer: Categorizer = None):
+        self.categorizer = categorizer or Categorizer()
+        self.reset(None)
+
+    def reset(self, root: Optional[str]):
+        """Empty the cube and measure depths from root"""
+        self.root_depth = os.path.join(root, '').count(os.sep) if root else 0
+        self.cells: Dict[Tuple[int, int, int], List[int]] = {}
+        self.file_count = 0
+        self.total_size = 0
+        self._dir_depths: List[int] = []
+        self._slot_days: Dict[int, int] = {}
+
+    def _depths(self, store) -> List[int]:
+        depths = self._dir_depths
+        root_depth = self.root_depth
+        for dir_path in store.dirs[len(depths):]:
+            depths.append(max(0, dir_path.count(os.sep) - root_depth))
+        return depths
+
+    def _local_day(self, timestamp: float) -> int:
+        slot = int(timestamp // SLOT)
+        day = self._slot_days.get(slot)
+        if day is None:
+            if len(self._slot_days) > 100000:
+                self._slot_days.clear()
+            day = self._slot_days[slot] = date.fromtimestamp(slot * SLOT).toordinal()
+        return day
+
+    def _update(self, store, records: Iterable[int], sign: int):
+        cells = self.cells
+        depths = self._depths(store)
+        local_day = self._local_day
+        ext_ids, dir_ids, sizes, mtimes = store.ext_ids, store.dir_ids, store.sizes, store.mtimes
+        files = size_total = 0
+        for i in records:
+            key = (ext_ids[i], local_day(mtimes[i]), depths[dir_ids[i]])
+            size = sizes[i] * sign
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [sign, size]
+            else:
+                cell[0] += sign
+                cell[1] += size
+                if not cell[0]:
+                    del cells[key]
+            files += sign
+            size_total += size
+        self.file_count += files
+        self.total_size += size_total
+
+    def add_records(self, store, records: Iterable[int]):
+        """Count newly stored records"""
+        self._update(store, records, 1)
+
+    def remove_records(self, store, records: Iterable[int]):
+        """Uncount records; call before the store removes them and zeroes their sizes"""
+        self._update(store, records, -1)
+
+    def rebuild(self, store, root: str):
+        """Recount every live record of store"""
+        self.reset(root)
+        self.add_records(store, store.records())
+
+    def _labels(self, store, dimension: str, now: float):
+        if dimension == 'extension':
+            return lambda ext_id, day, depth: store.ext_names[ext_id].lower() or '(none)'
+        if dimension == 'category':
+            category = self.categorizer.category
+            return lambda ext_id, day, depth: category(store.ext_names[ext_id])
+        if dimension == 'depth':
+            return lambda ext_id, day, depth: depth
+        if dimension == 'age':
+            today = date.fromtimestamp(now).toordinal()
+
+            def age(ext_id, day, depth):
+                days = today - day
+                for limit, label in AGE_BUCKETS:
+                    if days < limit:
+                        return label
+                return OLDER
+            return age
+        raise ValueError(f"Unknown dimension: {dimension}")
+
+    def extension_count(self, store) -> int:
+        """How many distinct extensions the counted files have"""
+        ext_names = store.ext_names
+        return len({ext_names[ext_id].lower() for ext_id, _, _ in self.cells})
+
+    def breakdown(self, store, dimension: str, now: float = None) -> List[Tuple[object, int, int]]:
+        """(label, files, bytes) per value of one dimension.
+
+        Categories keep the categorizer's order, age buckets run from
+        youngest to oldest and depths go up from 0; extensions come largest
+        first.
+        """
+        label_of = self._labels(store, dimension, now if now is not None else time.time())
+        totals: Dict[object, List[int]] = {}
+        for key, (files, size) in self.cells.items():
+            label = label_of(*key)
+            entry = totals.get(label)
+            if entry is None:
+                totals[label] = [files, size]
+            else:
+                entry[0] += files
+                entry[1] += size
+
+        if dimension == 'category':
+            order = self.categorizer.names
+        elif dimension == 'age':
+            order = [label for _, label in AGE_BUCKETS] + [OLDER]
+        elif dimension == 'depth':
+            order = sorted(totals)
+        else:
+            order = sorted(totals, key=lambda label: totals[label][1], reverse=True)
+        return [(label, *totals[label]) for label in order if label in totals]
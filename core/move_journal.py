@@ -0,0 +1,160 @@
+"""
+Move Journal - Append-only record of organize runs, for undo
+"""
+
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from core.organizer import MoveResult, move_file
+
+
+class JournalWriter:
+    """Appends the moves of one organize run to its journal file.
+
+    Moves are written ahead of being carried out, a batch at a time with
+    one flush and fsync per batch, so every file the run touches is in
+    the journal even if the app dies mid-run. Undo skips moves that never
+    happened.
+    """
+
+    def __init__(self, path: Path, header: dict):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._write([json.dumps(header)])
+
+    def _write(self, lines: List[str]):
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record(self, moves: Iterable[Tuple[str, str]]):
+        """Note that each (src, dst) is about to be moved"""
+        lines = [json.dumps([src, dst]) for src, dst in moves]
+        if lines:
+            self._write(lines)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MoveJournal:
+    """Journal files under ~/.workspace_organizer/journal/, one per organize run.
+
+    Each file starts with a JSON header (folder, label, time, created
+    directories) followed by one [source, destination] line per move.
+    Undone runs are renamed with an .undone suffix; a run whose undo left
+    files behind keeps just those moves, so undo can be tried again. Only
+    the newest keep runs are kept.
+    """
+
+    def __init__(self, journal_dir: Path = None, keep: int = 20):
+        self.journal_dir = journal_dir or Path.home() / ".workspace_organizer" / "journal"
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+
+    def begin(self, folder_path: str, label: str, dirs: List[str]) -> JournalWriter:
+        """Start journaling an organize run"""
+        self._prune()
+        now = datetime.now()
+        path = self.journal_dir / f"{now.strftime('%Y%m%d%H%M%S%f')}.jsonl"
+        header = {"folder": folder_path, "label": label, "time": now.isoformat(), "dirs": dirs}
+        return JournalWriter(path, header)
+
+    def _runs(self, pattern: str = "*.jsonl") -> List[Path]:
+        return sorted(self.journal_dir.glob(pattern))
+
+    def _prune(self):
+        runs = self._runs("*.jsonl*")
+        for path in runs[:max(0, len(runs) - self.keep + 1)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def latest(self) -> Optional[dict]:
+        """Header of the newest run not yet undone, plus its path and move count"""
+        runs = self._runs()
+        if not runs:
+            return None
+        path = runs[-1]
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                moves = sum(1 for line in f if line.strip())
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read move journal: {e}")
+            return None
+        header.update(path=str(path), moves=moves)
+        return header
+
+    def undo(self, path: str, progress: Optional[Callable[[int, int], None]] = None) -> MoveResult:
+        """Move every file of a run back, newest move first.
+
+        Works from the journal alone: no folder is scanned, each source
+        directory is recreated at most once, and directories the run
+        created are removed again once empty. Moves whose destination is
+        missing never happened and are skipped. If any file cannot be
+        moved back, the journal is rewritten with just those moves.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            moves = [json.loads(line) for line in f if line.strip()]
+
+        made = set()
+        moved = 0
+        failed = []
+        remaining = []
+        total = len(moves)
+        for done, (src, dst) in enumerate(reversed(moves), 1):
+            if os.path.lexists(dst):
+                src_dir = os.path.dirname(src)
+                try:
+                    if src_dir not in made:
+                        os.makedirs(src_dir, exist_ok=True)
+                        made.add(src_dir)
+                    move_file(dst, src)
+                    moved += 1
+                except OSError as e:
+                    failed.append((dst, str(e)))
+                    remaining.append((src, dst))
+            if progress is not None:
+                progress(done, total)
+
+        self._remove_empty_dirs(header.get("dirs", []), header.get("folder", ""))
+        if remaining:
+            self._rewrite(path, header, reversed(remaining))
+        else:
+            os.replace(path, path + ".undone")
+        return MoveResult(moved, failed)
+
+    @staticmethod
+    def _rewrite(path: str, header: dict, moves: Iterable[Tuple[str, str]]):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header) + "\n")
+            for src, dst in moves:
+                f.write(json.dumps([src, dst]) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove_empty_dirs(dirs: List[str], folder_path: str):
+        # Created directories and any parents made along with them, up to
+        # the organized folder, deepest first
+        for dir_path in sorted(dirs, reverse=True):
+            while os.path.normcase(dir_path) != os.path.normcase(folder_path):
+                try:
+                    os.rmdir(dir_path)
+                except OSError:
+                    break
+                dir_path = os.path.dirname(dir_path)
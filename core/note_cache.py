@@ -0,0 +1,118 @@
+"""
+Note Cache - Note metadata in memory, bodies on demand, writes straight through
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from core.note_store import ORDERS, NoteStore
+
+META_FIELDS = ("id", "title", "created", "modified")
+
+
+class NoteCache:
+    """Serves notes from memory in front of a NoteStore.
+
+    The id, title and dates of every note are loaded once and listings
+    are answered from them; bodies are read the first time a note is
+    opened and the most recently used max_bodies are kept. Saves and
+    deletes go to the store first and then update the cache, so the two
+    never disagree. The store file's mtime and size are remembered after
+    each of our own writes; if they change otherwise, another process has
+    written the store and the cache is reloaded before it is used.
+    """
+
+    def __init__(self, store: NoteStore, max_bodies: int = 256):
+        self.store = store
+        self.max_bodies = max_bodies
+        self.reload()
+
+    def _stamp(self) -> Tuple[int, int]:
+        try:
+            st = os.stat(self.store.db_path)
+        except OSError:
+            return (0, 0)
+        return (st.st_mtime_ns, st.st_size)
+
+    def reload(self):
+        """Drop everything cached and load the metadata index again"""
+        self._stamp_seen = self._stamp()
+        self._meta: Dict[str, dict] = {
+            note["id"]: note for note in self.store.list_notes(with_content=False)
+        }
+        self._bodies: "OrderedDict[str, str]" = OrderedDict()
+        self._orders: Dict[str, List[str]] = {}
+
+    def _check(self):
+        if self._stamp() != self._stamp_seen:
+            self.reload()
+
+    def _changed(self):
+        self._orders.clear()
+        self._stamp_seen = self._stamp()
+
+    def _keep_body(self, note_id: str, content: str):
+        self._bodies[note_id] = content
+        self._bodies.move_to_end(note_id)
+        if len(self._bodies) > self.max_bodies:
+            self._bodies.popitem(last=False)
+
+    def __len__(self) -> int:
+        self._check()
+        return len(self._meta)
+
+    def list_notes(self, order_by: str = "created", limit: int = -1, offset: int = 0) -> List[dict]:
+        """Metadata of notes newest first by created or modified time"""
+        if order_by not in ORDERS:
+            raise ValueError(f"Cannot order notes by {order_by!r}")
+        self._check()
+        order = self._orders.get(order_by)
+        if order is None:
+            meta = self._meta
+            order = self._orders[order_by] = sorted(meta, key=lambda i: (meta[i][order_by], i), reverse=True)
+        end = None if limit < 0 else offset + limit
+        return [dict(self._meta[note_id]) for note_id in order[offset:end]]
+
+    def meta(self, note_id: str) -> Optional[dict]:
+        """Metadata of a note without loading its body"""
+        self._check()
+        meta = self._meta.get(note_id)
+        return dict(meta) if meta else None
+
+    def get(self, note_id: str) -> Optional[dict]:
+        """A note with its body, read from the store the first time"""
+        self._check()
+        meta = self._meta.get(note_id)
+        if meta is None:
+            return None
+        content = self._bodies.get(note_id)
+        if content is None:
+            note = self.store.get(note_id)
+            if note is None:
+                return None
+            content = note["content"]
+        self._keep_body(note_id, content)
+        return dict(meta, content=content)
+
+    def put(self, note: dict):
+        """Save a note to the store and the cache"""
+        self.put_many([note])
+
+    def put_many(self, notes: List[dict]):
+        """Save many notes in one store transaction"""
+        self._check()
+        self.store.put_many(notes)
+        for note in notes:
+            self._meta[note["id"]] = {field: note.get(field, "") for field in META_FIELDS}
+            self._keep_body(note["id"], note.get("content", ""))
+        self._changed()
+
+    def delete(self, note_id: str) -> bool:
+        """Delete a note from the store and the cache"""
+        self._check()
+        existed = self.store.delete(note_id)
+        self._meta.pop(note_id, None)
+        self._bodies.pop(note_id, None)
+        self._changed()
+        return existed
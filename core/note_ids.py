@@ -0,0 +1,48 @@
+"""
+Note IDs - Sortable, collision-free identifiers in the ULID format
+"""
+
+import os
+import time
+import threading
+
+# Crockford's base32, as used by ULIDs
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+RANDOM_BITS = 80
+
+
+class NoteIdGenerator:
+    """Makes 26-character ULIDs: 48 bits of milliseconds, then 80 random bits.
+
+    IDs sort in the order they were made. Within one millisecond, or if
+    the clock steps back, the previous ID's random part is incremented
+    instead of drawing a new one, so any number of notes saved in quick
+    succession still get distinct, increasing IDs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def new_id(self) -> str:
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms > self._last_ms:
+                random_part = int.from_bytes(os.urandom(RANDOM_BITS // 8), 'big')
+            else:
+                ms = self._last_ms
+                random_part = self._last_random + 1
+                if random_part >> RANDOM_BITS:
+                    ms += 1
+                    random_part = 0
+            self._last_ms = ms
+            self._last_random = random_part
+
+        value = (ms << RANDOM_BITS) | random_part
+        chars = []
+        for _ in range(26):
+            chars.append(ALPHABET[value & 31])
+            value >>= 5
+        return "".join(reversed(chars))
@@ -0,0 +1,59 @@
+"""
+Note I/O - Stream notes to and from JSON Lines files
+"""
+
+import os
+import gzip
+import json
+from typing import IO, Iterable, Iterator
+
+FIELDS = ("id", "title", "content", "created", "modified")
+
+
+def _open(path: str, mode: str, compressed: bool) -> IO[str]:
+    if compressed:
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=6)
+    return open(path, mode, encoding='utf-8')
+
+
+def write_jsonl(path: str, notes: Iterable[dict]) -> int:
+    """Write notes one JSON object per line and return how many.
+
+    Notes are written as they are pulled from the iterable, so memory
+    does not grow with the export, and gzip-compressed if path ends in
+    .gz. The file is written under a temporary name and renamed into
+    place, so an interrupted export never leaves a truncated file behind.
+    """
+    tmp_path = path + ".tmp"
+    count = 0
+    try:
+        with _open(tmp_path, 'w', path.endswith('.gz')) as f:
+            for note in notes:
+                f.write(json.dumps({field: note.get(field, "") for field in FIELDS}, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def iter_jsonl(path: str) -> Iterator[dict]:
+    """Yield the notes of a JSON Lines (or .gz) file one at a time, skipping bad lines"""
+    with _open(path, 'r', path.endswith('.gz')) as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                note = json.loads(line)
+            except ValueError as e:
+                print(f"Warning: Skipping line {line_no} of {path}: {e}")
+                continue
+            if isinstance(note, dict) and isinstance(note.get("content"), str):
+                yield note
+            else:
+                print(f"Warning: Skipping line {line_no} of {path}: not a note")
@@ -0,0 +1,118 @@
+"""
+Note PDF - Lay out notes into a PDF as they are read, a chunk at a time
+"""
+
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+
+class ExportCancelled(Exception):
+    """Raised inside the layout loop to stop an export"""
+
+
+class _StoryFeed(list):
+    """A story list that tops itself up from a generator of flowable chunks.
+
+    The layout loop checks len() before every flowable and only ever
+    takes from the front, so refilling there keeps just a chunk or two
+    of flowables alive instead of the whole document's story.
+    """
+
+    def __init__(self, chunks: Iterator[list], low_water: int = 64):
+        super().__init__()
+        self._chunks = chunks
+        self.low_water = low_water
+
+    def __len__(self):
+        while self._chunks is not None and list.__len__(self) < self.low_water:
+            try:
+                self.extend(next(self._chunks))
+            except StopIteration:
+                self._chunks = None
+        return list.__len__(self)
+
+
+def _styles():
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor='#333333',
+            spaceAfter=30,
+            alignment=1  # Center
+        ),
+        'date': ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor='#666666',
+            spaceAfter=20
+        ),
+        'heading': styles['Heading2'],
+        'body': styles['Normal'],
+    }
+
+
+def _note_flowables(note: dict, styles) -> List:
+    flowables = [
+        Paragraph(escape(note.get('title') or "Untitled"), styles['heading']),
+        Paragraph(escape(f"Created {note.get('created', '')[:16].replace('T', ' ')}"), styles['date']),
+    ]
+    # One paragraph per block of lines rather than per line
+    for block in note.get('content', '').split('\n\n'):
+        if block.strip():
+            flowables.append(Paragraph(escape(block.strip()).replace('\n', '<br/>'), styles['body']))
+            flowables.append(Spacer(1, 0.1 * inch))
+    flowables.append(Spacer(1, 0.2 * inch))
+    return flowables
+
+
+def export_notes_pdf(path: str, notes: Iterable[dict], total: int = 0,
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     cancelled: Callable[[], bool] = lambda: False,
+                     chunk_size: int = 50) -> int:
+    """Write notes to a PDF and return how many were exported.
+
+    Notes are pulled from the iterable chunk_size at a time as the
+    layout reaches them, so a large export never builds its whole story
+    up front. progress(done, total) is called after each chunk; once
+    cancelled() returns true ExportCancelled is raised and no file is
+    written.
+    """
+    styles = _styles()
+    done = 0
+
+    def chunks():
+        nonlocal done
+        yield [
+            Paragraph("Workspace Organizer - Notes Export", styles['title']),
+            Spacer(1, 0.3 * inch),
+            Paragraph(f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['date']),
+            Spacer(1, 0.2 * inch),
+        ]
+        chunk = []
+        for note in notes:
+            chunk.extend(_note_flowables(note, styles))
+            done += 1
+            if done % chunk_size == 0:
+                if cancelled():
+                    raise ExportCancelled()
+                if progress is not None:
+                    progress(done, total)
+                yield chunk
+                chunk = []
+        if progress is not None:
+            progress(done, total)
+        yield chunk
+
+    doc = SimpleDocTemplate(path, pagesize=letter)
+    doc.build(_StoryFeed(chunks()))
+    return done
@@ -0,0 +1,211 @@
+"""
+Note Store - Notes in a single SQLite file with a full-text index
+"""
+
+import re
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created TEXT NOT NULL,
+    modified TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_created ON notes (created);
+CREATE INDEX IF NOT EXISTS notes_modified ON notes (modified);
+"""
+
+# External-content FTS table over notes, kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    title, content, content='notes', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+"""
+
+FIELDS = ("id", "title", "content", "created", "modified")
+ORDERS = ("created", "modified")
+
+# Schema versions, kept in PRAGMA user_version
+JSON_MIGRATED = 1
+
+# Title matches count this many times more than body matches in the ranking
+TITLE_WEIGHT = 10.0
+
+
+def _fts_query(text: str) -> str:
+    """Every word of text as a quoted prefix term, so user input is never FTS syntax"""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
+
+
+class NoteStore:
+    """SQLite store of notes under ~/.workspace_organizer/.
+
+    Notes are rows indexed by created and modified time, so listings are
+    read in order straight from an index. An FTS5 table over titles and
+    contents answers searches ranked by bm25, with title hits weighted
+    above body hits; where SQLite is built without FTS5, search falls
+    back to a substring scan.
+    """
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path or Path.home() / ".workspace_organizer" / "notes.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            try:
+                conn.executescript(FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:
+                self.fts = False
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the store usable from worker threads
+        conn = sqlite3.connect(str(self.db_path))
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def migrate_json(self, notes_dir: Path) -> int:
+        """Import the one-file-per-note JSON notes once, returning how many.
+
+        The JSON files are left in place as a backup; the store records
+        that it has imported them and never reads them again.
+        """
+        with self._connect() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= JSON_MIGRATED:
+                return 0
+            notes = []
+            for note_file in sorted(notes_dir.glob("*.json")):
+                try:
+                    with open(note_file, 'r', encoding='utf-8') as f:
+                        note = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Could not import note {note_file.name}: {e}")
+                    continue
+                if not isinstance(note, dict):
+                    print(f"Warning: Could not import note {note_file.name}: not a note")
+                    continue
+                note.setdefault("id", note_file.stem)
+                note.setdefault("created", note.get("modified", ""))
+                note.setdefault("modified", note["created"])
+                notes.append(note)
+            self._upsert(conn, notes)
+            conn.execute(f"PRAGMA user_version = {JSON_MIGRATED}")
+        return len(notes)
+
+    @staticmethod
+    def _upsert(conn, notes: Iterable[dict]):
+        conn.executemany(
+            "INSERT INTO notes (id, title, content, created, modified) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET title = excluded.title, content = excluded.content, "
+            "created = excluded.created, modified = excluded.modified",
+            (tuple(str(note.get(field, "")) for field in FIELDS) for note in notes)
+        )
+
+    def put(self, note: dict):
+        """Insert or replace a note"""
+        self.put_many([note])
+
+    def put_many(self, notes: Iterable[dict]):
+        """Insert or replace many notes in one transaction"""
+        with self._connect() as conn:
+            self._upsert(conn, notes)
+
+    def get(self, note_id: str) -> Optional[dict]:
+        """A note by id, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, title, content, created, modified FROM notes WHERE id = ?", (note_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def delete(self, note_id: str) -> bool:
+        """Delete a note, returning whether it existed"""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM notes WHERE id = ?", (note_id,)).rowcount > 0
+
+    def count(self) -> int:
+        """Number of stored notes"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def list_notes(self, order_by: str = "created", limit: int = -1, offset: int = 0,
+                   with_content: bool = True) -> List[dict]:
+        """Notes newest first by created or modified time, read in index order"""
+        if order_by not in ORDERS:
+            raise ValueError(f"Cannot order notes by {order_by!r}")
+        columns = ", ".join(FIELDS if with_content else (f for f in FIELDS if f != "content"))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {columns} FROM notes ORDER BY {order_by} DESC, id DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def iter_notes(self, batch_size: int = 1000) -> Iterator[dict]:
+        """Yield every note in the order stored, reading batch_size rows at a time.
+
+        Each batch is a short query of its own, so a slow consumer never
+        holds the database open and memory stays at one batch.
+        """
+        last = 0
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT rowid, id, title, content, created, modified FROM notes "
+                    "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield {field: row[field] for field in FIELDS}
+            last = rows[-1]["rowid"]
+
+    def search(self, query: str, limit: int = 50) -> List[dict]:
+        """Notes matching every word of query as a prefix, best match first"""
+        if not self.fts:
+            return self._scan(query, limit)
+        match = _fts_query(query)
+        if not match:
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT n.id, n.title, n.content, n.created, n.modified, "
+                "bm25(notes_fts, ?, 1.0) AS rank "
+                "FROM notes_fts JOIN notes n ON n.rowid = notes_fts.rowid "
+                "WHERE notes_fts MATCH ? ORDER BY rank LIMIT ?",
+                (TITLE_WEIGHT, match, limit)
+            ).fetchall()
+        return [{field: row[field] for field in FIELDS} for row in rows]
+
+    def _scan(self, query: str, limit: int) -> List[dict]:
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, title, content, created, modified FROM notes "
+                "WHERE title LIKE ? ESCAPE '\\' OR content LIKE ? ESCAPE '\\' "
+                "ORDER BY (title LIKE ? ESCAPE '\\') DESC, modified DESC LIMIT ?",
+                (pattern, pattern, pattern, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
@@ -2,63 +2,72 @@
 Notes Manager - Handle notes operations
 """
 
-import json
-import os
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import Iterable, Iterator, List, Tuple
+
+from core.note_store import NoteStore
+from core.note_cache import NoteCache
+from core.note_ids import NoteIdGenerator
+from core.note_io import iter_jsonl, write_jsonl
 
 
 class NotesManager:
-    def __init__(self):
-        self.notes_dir = Path.home() / ".workspace_organizer" / "notes"
+    def __init__(self, data_dir: Path = None):
+        data_dir = data_dir or Path.home() / ".workspace_organizer"
+        self.notes_dir = data_dir / "notes"
         self.notes_dir.mkdir(parents=True, exist_ok=True)
+        self.store = NoteStore(data_dir / "notes.db")
+        self.store.migrate_json(self.notes_dir)
+        self.cache = NoteCache(self.store)
+        self.ids = NoteIdGenerator()
     
-    def save_note(self, content: str, title: str = "") -> str:
-        """Save a note and return its ID"""
+    def _new_note(self, content: str, title: str = "", note_id: str = None) -> dict:
         timestamp = datetime.now().isoformat()
-        note_id = datetime.now().strftime("%Y%m%d%H%M%S")
         
         if not title:
             # Use first 30 chars as title
             title = content[:30] + ("..." if len(content) > 30 else "")
         
-        note_data = {
-            "id": note_id,
+        return {
+            "id": str(note_id) if note_id else self.ids.new_id(),
             "title": title,
             "content": content,
             "created": timestamp,
             "modified": timestamp
         }
-        
-        note_file = self.notes_dir / f"{note_id}.json"
-        with open(note_file, 'w', encoding='utf-8') as f:
-            json.dump(note_data, f, indent=2)
-        
-        return note_id
+    
+    def save_note(self, content: str, title: str = "") -> str:
+        """Save a note and return its ID"""
+        note_data = self._new_note(content, title)
+        self.cache.put(note_data)
+        return note_data["id"]
+    
+    def save_notes(self, notes: Iterable[Tuple[str, str]]) -> List[str]:
+        """Save many (content, title) notes in one transaction and return their IDs"""
+        new_notes = [self._new_note(content, title) for content, title in notes]
+        self.cache.put_many(new_notes)
+        return [note["id"] for note in new_notes]
+    
+    def note_count(self) -> int:
+        """Number of saved notes"""
+        return len(self.cache)
     
     def get_all_notes(self) -> List[dict]:
-        """Get all notes"""
-        notes = []
-        for note_file in self.notes_dir.glob("*.json"):
-            try:
-                with open(note_file, 'r', encoding='utf-8') as f:
-                    note = json.load(f)
-                    notes.append(note)
-            except:
-                pass
-        
-        # Sort by created date (newest first)
-        notes.sort(key=lambda x: x.get('created', ''), reverse=True)
-        return notes
+        """Get all notes, newest first"""
+        return self.store.list_notes()
+    
+    def iter_notes(self) -> Iterator[dict]:
+        """Every note with its content, streamed from the store a batch at a time"""
+        return self.store.iter_notes()
+    
+    def list_notes(self, order_by: str = "created", limit: int = -1, offset: int = 0) -> List[dict]:
+        """Notes without their content, newest first by created or modified date"""
+        return self.cache.list_notes(order_by, limit, offset)
     
     def get_note(self, note_id: str) -> dict:
         """Get a specific note"""
-        note_file = self.notes_dir / f"{note_id}.json"
-        if note_file.exists():
-            with open(note_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        return self.cache.get(note_id) or {}
     
     def get_note_by_id(self, note_id: str) -> dict:
         """Get a specific note by ID (alias for get_note)"""
@@ -66,39 +75,50 @@ class NotesManager:
     
     def update_note(self, note_id: str, content: str, title: str = "") -> bool:
         """Update a note"""
-        note_file = self.notes_dir / f"{note_id}.json"
-        if not note_file.exists():
+        note = self.cache.meta(note_id)
+        if note is None:
             return False
         
-        with open(note_file, 'r', encoding='utf-8') as f:
-            note = json.load(f)
-        
         note['content'] = content
         if title:
             note['title'] = title
         note['modified'] = datetime.now().isoformat()
         
-        with open(note_file, 'w', encoding='utf-8') as f:
-            json.dump(note, f, indent=2)
-        
+        self.cache.put(note)
         return True
     
     def delete_note(self, note_id: str) -> bool:
         """Delete a note"""
-        note_file = self.notes_dir / f"{note_id}.json"
-        if note_file.exists():
-            note_file.unlink()
-            return True
-        return False
+        return self.cache.delete(note_id)
     
-    def search_notes(self, query: str) -> List[dict]:
-        """Search notes by content"""
-        query = query.lower()
-        results = []
-        
-        for note in self.get_all_notes():
-            if (query in note.get('title', '').lower() or
-                query in note.get('content', '').lower()):
-                results.append(note)
+    def search_notes(self, query: str, limit: int = 50) -> List[dict]:
+        """Search note titles and content, best matches first"""
+        return self.store.search(query, limit)
+    
+    def export_notes(self, path: str) -> int:
+        """Export every note to a JSON Lines file (gzip-compressed if path ends in .gz)"""
+        return write_jsonl(path, self.iter_notes())
+    
+    def import_notes(self, path: str, batch_size: int = 1000) -> int:
+        """Import notes from a JSON Lines file, a transaction per batch.
         
-        return results
+        Notes keep their IDs, so importing an export again replaces the
+        same notes instead of duplicating them; notes without one get a
+        new ID.
+        """
+        count = 0
+        batch = []
+        for note in iter_jsonl(path):
+            imported = self._new_note(note["content"], str(note.get("title") or ""), note.get("id"))
+            for field in ("created", "modified"):
+                if note.get(field):
+                    imported[field] = str(note[field])
+            batch.append(imported)
+            if len(batch) >= batch_size:
+                self.cache.put_many(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.cache.put_many(batch)
+            count += len(batch)
+        return count
@@ -0,0 +1,196 @@
+"""
+Organizer - Plan file moves up front, then carry them out in one pass
+"""
+
+import os
+import errno
+import queue
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+class MovePlan(NamedTuple):
+    """Everything an organize run will do, computed without touching files"""
+    moves: List[Tuple[str, str]]  # (source path, destination path)
+    dirs: List[str]  # directories to create, parents before children
+    renamed: int  # moves whose file name was changed to avoid a collision
+
+
+class MoveResult(NamedTuple):
+    """Outcome of executing a plan"""
+    moved: int
+    failed: List[Tuple[str, str]]  # (source path, error message)
+
+
+def _free_name(name: str, taken: Set[str]) -> str:
+    """First of name, "stem (1).ext", "stem (2).ext"... not in taken"""
+    if os.path.normcase(name) not in taken:
+        return name
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while True:
+        candidate = f"{stem} ({n}){ext}"
+        if os.path.normcase(candidate) not in taken:
+            return candidate
+        n += 1
+
+
+def build_plan(targets: Iterable[Tuple[str, str]]) -> MovePlan:
+    """Plan moving each (source path, destination directory) pair.
+
+    Files already in their destination are left alone. Each destination
+    is listed at most once to learn which names are taken, and a file
+    whose name is taken, on disk or by an earlier move in the plan, gets
+    a numbered name instead of overwriting or being skipped.
+    """
+    taken: Dict[str, Set[str]] = {}
+    moves = []
+    renamed = 0
+
+    for src, dst_dir in targets:
+        src_dir, name = os.path.split(src)
+        if os.path.normcase(src_dir) == os.path.normcase(dst_dir):
+            continue
+
+        names = taken.get(dst_dir)
+        if names is None:
+            try:
+                names = {os.path.normcase(entry) for entry in os.listdir(dst_dir)}
+            except OSError:
+                names = set()
+            taken[dst_dir] = names
+
+        free = _free_name(name, names)
+        if free != name:
+            renamed += 1
+        names.add(os.path.normcase(free))
+        moves.append((src, os.path.join(dst_dir, free)))
+
+    dirs = sorted(d for d in taken if not os.path.isdir(d))
+    return MovePlan(moves, dirs, renamed)
+
+
+def move_file(src: str, dst: str):
+    """Move a file by renaming it, copying only across filesystems"""
+    # os.rename silently replaces an existing file on POSIX
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, "Destination exists", dst)
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+
+def _move_chunk(moves):
+    results = []
+    for src, dst in moves:
+        try:
+            move_file(src, dst)
+            results.append((src, dst, None))
+        except OSError as e:
+            results.append((src, dst, str(e)))
+    return results
+
+
+class PlanExecutor:
+    """Carry out a MovePlan on a pool of threads, queued per device pair.
+
+    Moves are grouped by the devices of their source and destination.
+    Same-device moves are renames, which only touch directory entries, and
+    run rename_workers at a time in chunks. Cross-device moves copy whole
+    files and run copy_workers at a time per device pair, so a slow disk
+    is not asked to seek between many large copies. Results are collected
+    on the calling thread, which reports progress(done, total) and
+    journals each chunk before handing it out. After cancel(), moves
+    already handed out still finish; the rest are not attempted.
+    """
+
+    def __init__(self, rename_workers: int = 8, copy_workers: int = 1, chunk_size: int = 64,
+                 progress: Optional[Callable[[int, int], None]] = None):
+        self.rename_workers = max(1, rename_workers)
+        self.copy_workers = max(1, copy_workers)
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop starting new moves"""
+        self.cancelled = True
+
+    def _queues(self, moves) -> Dict[Tuple[int, int], deque]:
+        devices: Dict[str, int] = {}
+
+        def device(dir_path):
+            dev = devices.get(dir_path)
+            if dev is None:
+                try:
+                    dev = os.stat(dir_path).st_dev
+                except OSError:
+                    dev = -1
+                devices[dir_path] = dev
+            return dev
+
+        grouped: Dict[Tuple[int, int], List[Tuple[str, str]]] = {}
+        for src, dst in moves:
+            key = (device(os.path.dirname(src)), device(os.path.dirname(dst)))
+            grouped.setdefault(key, []).append((src, dst))
+
+        queues = {}
+        for key, group in grouped.items():
+            size = self.chunk_size if key[0] == key[1] else 1
+            queues[key] = deque(group[i:i + size] for i in range(0, len(group), size))
+        return queues
+
+    def execute(self, plan: MovePlan, journal=None) -> MoveResult:
+        """Create the plan's directories once, then move every file.
+
+        A file that cannot be moved is recorded and the rest still run.
+        Every move is recorded to journal (a JournalWriter), if one is
+        given, before it is attempted.
+        """
+        for dir_path in plan.dirs:
+            os.makedirs(dir_path, exist_ok=True)
+
+        queues = self._queues(plan.moves)
+        running = dict.fromkeys(queues, 0)
+        finished = queue.SimpleQueue()
+        in_flight = done = moved = 0
+        failed = []
+        total = len(plan.moves)
+
+        with ThreadPoolExecutor(max_workers=self.rename_workers + self.copy_workers) as pool:
+            while True:
+                if not self.cancelled:
+                    starting = []
+                    for key, chunks in queues.items():
+                        limit = self.rename_workers if key[0] == key[1] else self.copy_workers
+                        while chunks and running[key] < limit:
+                            starting.append((key, chunks.popleft()))
+                            running[key] += 1
+                    # Journal the moves before any of them is made
+                    if journal is not None and starting:
+                        journal.record(move for _, chunk in starting for move in chunk)
+                    for key, chunk in starting:
+                        future = pool.submit(_move_chunk, chunk)
+                        future.add_done_callback(lambda f, key=key: finished.put((key, f)))
+                        in_flight += 1
+                if not in_flight:
+                    break
+
+                key, future = finished.get()
+                running[key] -= 1
+                in_flight -= 1
+                results = future.result()
+                for src, dst, error in results:
+                    if error is None:
+                        moved += 1
+                    else:
+                        failed.append((src, error))
+                done += len(results)
+                if self.progress is not None:
+                    self.progress(done, total)
+        return MoveResult(moved, failed)
@@ -0,0 +1,64 @@
+"""
+Recent Files - The most recently modified scanned files, kept up to date
+"""
+
+import heapq
+from typing import Iterable, List, Tuple
+
+
+class RecentFiles:
+    """Top records of a FileStore by modification time.
+
+    Holds a min-heap of the newest capacity records as (mtime, record)
+    pairs, fed from the mtimes captured by the scan. Added records only
+    need a comparison against the oldest kept entry, so a scan keeps the
+    list current as it streams in. Removing a kept record marks the heap
+    stale and the next query rebuilds it with one heapq.nlargest pass
+    over the store, O(n log k) instead of sorting every file.
+    """
+
+    def __init__(self, capacity: int = 50):
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self):
+        """Forget every record"""
+        self._heap: List[Tuple[float, int]] = []
+        self._kept = set()
+        self._stale = False
+
+    def add_records(self, store, records: Iterable[int]):
+        """Consider newly stored records"""
+        if self._stale:
+            return
+        heap, kept, mtimes = self._heap, self._kept, store.mtimes
+        for i in records:
+            item = (mtimes[i], i)
+            if len(heap) < self.capacity:
+                heapq.heappush(heap, item)
+                kept.add(i)
+            elif item > heap[0]:
+                kept.discard(heapq.heapreplace(heap, item)[1])
+                kept.add(i)
+
+    def remove(self, records: Iterable[int]):
+        """Forget removed records"""
+        if not self._stale and not self._kept.isdisjoint(records):
+            self._stale = True
+
+    def rebuild(self, store):
+        """Recompute the kept records from the whole store"""
+        self._heap = heapq.nlargest(
+            self.capacity, ((store.mtimes[i], i) for i in store.records())
+        )
+        heapq.heapify(self._heap)
+        self._kept = {i for _, i in self._heap}
+        self._stale = False
+
+    def top(self, store, limit: int = 20) -> List[int]:
+        """Records of the limit most recently modified files, newest first"""
+        if limit > self.capacity:
+            return [i for _, i in heapq.nlargest(limit, ((store.mtimes[i], i) for i in store.records()))]
+        if self._stale:
+            self.rebuild(store)
+        return [i for _, i in heapq.nlargest(limit, self._heap)]
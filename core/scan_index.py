@@ -0,0 +1,104 @@
+"""
+Scan Index - Persistent per-directory listing cache keyed by directory mtime
+"""
+
+import os
+import json
+import time
+import sqlite3
+from itertools import starmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from core.scanner import ScanEntry
+
+
+# Listings whose directory changed this recently are stored as stale, since
+# another change within the same mtime tick would otherwise go unnoticed
+RACY_WINDOW_NS = 2 * 10**9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL,
+    files TEXT NOT NULL
+);
+"""
+
+# dir path -> (mtime_ns, files, subdir paths)
+DirListing = Tuple[int, List[ScanEntry], List[str]]
+
+
+class ScanIndex:
+    """SQLite store of directory listings under ~/.workspace_organizer/.
+
+    A directory is only re-listed when its mtime differs from the stored
+    one. Directory mtimes change when entries are added, removed or
+    renamed, not when a file's contents change, so size and mtime of
+    existing files are refreshed only when their directory is re-listed.
+    """
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path or Path.home() / ".workspace_organizer" / "scan_index.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the index usable from worker threads
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, root: str) -> Dict[str, DirListing]:
+        """Load every stored listing at or below root"""
+        listings = {}
+        prefix = os.path.join(root, '')
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT path, mtime_ns, subdirs, files FROM dirs "
+                    "WHERE path = ? OR (path >= ? AND path < ?)",
+                    (root, prefix, upper)
+                )
+                # One row per directory with its files packed as JSON keeps
+                # loading a large unchanged tree to a single decode per folder
+                for path, mtime_ns, subdirs, files in rows:
+                    listings[path] = (
+                        mtime_ns,
+                        list(starmap(ScanEntry, json.loads(files))),
+                        json.loads(subdirs)
+                    )
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Warning: Could not load scan index: {e}")
+            return {}
+        return listings
+
+    def save(self, updates: Dict[str, DirListing], removed: Iterable[str] = ()):
+        """Store re-listed directories and drop ones that no longer exist"""
+        racy_before = time.time_ns() - RACY_WINDOW_NS
+        try:
+            with self._connect() as conn:
+                conn.executemany("DELETE FROM dirs WHERE path = ?", ((d,) for d in removed))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO dirs (path, mtime_ns, subdirs, files) VALUES (?, ?, ?, ?)",
+                    (
+                        (dir_path, mtime_ns if mtime_ns <= racy_before else -1,
+                         json.dumps(subdirs), json.dumps(files))
+                        for dir_path, (mtime_ns, files, subdirs) in updates.items()
+                    )
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: Could not save scan index: {e}")
+
+    def clear(self):
+        """Forget every stored listing"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM dirs")
@@ -0,0 +1,142 @@
+"""
+File Scanner - Parallel os.scandir based folder scanning
+"""
+
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+
+class ScanEntry(NamedTuple):
+    """A scanned file with the stat fields the app needs"""
+    path: str
+    size: int
+    mtime: float
+    ext: str
+
+
+class FileScanner:
+    """Walk a folder tree with os.scandir, listing directories on a thread pool.
+
+    Each file costs a single stat (served from the DirEntry where the
+    platform provides it), and path, size, mtime and extension are
+    collected in the same pass.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    def list_dir(self, dir_path: str) -> Optional[Tuple[List[ScanEntry], List[str]]]:
+        """List one directory, returning its files and subdirectory paths.
+
+        Returns None if the directory cannot be read, so a failed listing
+        is never mistaken for an empty one.
+        """
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    files.append(ScanEntry(
+                        entry.path,
+                        st.st_size,
+                        st.st_mtime,
+                        os.path.splitext(entry.name)[1]
+                    ))
+        except OSError:
+            return None
+        return files, subdirs
+
+    def iter_scan(self, folder_path: str, max_depth: int = 3, index=None) -> Iterator[List[ScanEntry]]:
+        """Scan folder_path down to max_depth levels, yielding each directory's files.
+
+        With a ScanIndex, directories whose mtime matches the stored one
+        are served from the index and only changed ones are re-listed.
+        Closing the generator early cancels directories not yet listed.
+        """
+        cached = index.load(folder_path) if index is not None else {}
+        updates = {}
+        visited = set()
+        complete = False
+        
+        def visit(dir_path):
+            if index is None:
+                listing = self.list_dir(dir_path)
+                return None if listing is None else (*listing, None)
+            try:
+                mtime_ns = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                return None
+            listing = cached.get(dir_path)
+            if listing and listing[0] == mtime_ns:
+                return listing[1], listing[2], None
+            listing = self.list_dir(dir_path)
+            if listing is None:
+                # Unreadable for now: leave it out of the index so the next
+                # scan lists it again instead of serving it as empty
+                return None
+            files, subdirs = listing
+            return files, subdirs, (mtime_ns, files, subdirs)
+        
+        def collect(dir_path, depth, outcome):
+            if outcome is None:
+                return [], []
+            files, subdirs, update = outcome
+            visited.add(dir_path)
+            if update:
+                updates[dir_path] = update
+            return files, subdirs if depth < max_depth else []
+        
+        try:
+            if self.max_workers <= 1:
+                stack = [(folder_path, 0)]
+                while stack:
+                    dir_path, depth = stack.pop()
+                    files, subdirs = collect(dir_path, depth, visit(dir_path))
+                    stack.extend((subdir, depth + 1) for subdir in subdirs)
+                    yield files
+            else:
+                # Completed listings are handed back through a queue so the
+                # dispatch loop stays O(1) per directory however wide the tree is
+                done = queue.SimpleQueue()
+                pool = ThreadPoolExecutor(max_workers=self.max_workers)
+                
+                def submit(dir_path, depth):
+                    future = pool.submit(visit, dir_path)
+                    future.add_done_callback(lambda f: done.put((f, dir_path, depth)))
+                
+                try:
+                    submit(folder_path, 0)
+                    outstanding = 1
+                    while outstanding:
+                        future, dir_path, depth = done.get()
+                        outstanding -= 1
+                        files, subdirs = collect(dir_path, depth, future.result())
+                        for subdir in subdirs:
+                            submit(subdir, depth + 1)
+                            outstanding += 1
+                        yield files
+                finally:
+                    pool.shutdown(wait=True, cancel_futures=True)
+            complete = True
+        finally:
+            if index is not None:
+                # A partial scan only proves the listings it refreshed, not
+                # which stored directories have disappeared
+                removed = [d for d in cached if d not in visited] if complete else []
+                index.save(updates, removed)
+    
+    def scan(self, folder_path: str, max_depth: int = 3, index=None) -> List[ScanEntry]:
+        """Scan folder_path down to max_depth levels and return every file"""
+        results = []
+        for files in self.iter_scan(folder_path, max_depth, index):
+            results.extend(files)
+        return results
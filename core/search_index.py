@@ -0,0 +1,300 @@
+"""
+Search Index - In-memory inverted index for global search
+"""
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Longest run of vocabulary a short word prefix may expand to, and the
+# most postings that expansion may gather before it stops
+MAX_PREFIX_EXPANSION = 256
+MAX_PREFIX_POSTINGS = 50000
+
+# Tombstoned postings tolerated before a kind is rebuilt; past this it is
+# rebuilt once they outnumber the live ones
+COMPACT_MIN_POSTINGS = 100000
+
+# Scores, best first
+TITLE_EXACT = 100
+TITLE_PREFIX = 80
+TITLE_SUBSTRING = 60
+WORDS_EXACT = 50
+WORDS_PREFIX = 40
+BODY_SUBSTRING = 30
+RANKS = (TITLE_EXACT, TITLE_PREFIX, TITLE_SUBSTRING, WORDS_EXACT, WORDS_PREFIX, BODY_SUBSTRING)
+
+
+def trigrams(text: str) -> set:
+    """Every three-character run of text"""
+    return {text[j:j + 3] for j in range(len(text) - 2)}
+
+
+class SearchResult(NamedTuple):
+    """A ranked search hit"""
+    score: int
+    kind: str
+    key: Hashable
+    title: str
+    data: object
+
+
+def tokenize(text: str) -> List[str]:
+    """Split lowercased text into words"""
+    return TOKEN_RE.findall(text.lower())
+
+
+class _KindIndex:
+    """Postings for one kind of document.
+
+    Titles and bodies both get a trigram index for substring matches and
+    a word index for whole-word and word-prefix matches. Queries too short
+    for a trigram are matched against the titles by a plain scan. Bodies are stored
+    once however many documents share them (a folder's path is the body
+    of every file in it), and their trigrams point at the body rather than
+    at each document. Replaced or removed documents are tombstoned and
+    skipped when searching; once their postings outnumber the live ones
+    the kind is rebuilt from the live documents.
+    """
+
+    def __init__(self):
+        # (key, title, lowercased title, data, body id or -1, postings)
+        self.docs: List[Optional[Tuple[Hashable, str, str, object, int, int]]] = []
+        self.ids: Dict[Hashable, int] = {}
+        self.grams: Dict[str, array] = {}
+        self.tokens: Dict[str, array] = {}
+        self.body_ids: Dict[str, int] = {}
+        self.bodies: List[str] = []
+        self.body_docs: List[array] = []
+        self.body_grams: Dict[str, array] = {}
+        self.live_postings = 0
+        self.dead_postings = 0
+        self._vocab: Optional[List[str]] = None
+        self._token_cache: Dict[str, List[str]] = {}
+
+    def add(self, key, title, text, data):
+        self.remove(key)
+
+        doc_id = len(self.docs)
+        title_lower = title.lower()
+        grams = trigrams(title_lower)
+        for gram in grams:
+            postings = self.grams.get(gram)
+            if postings is None:
+                postings = self.grams[gram] = array('i')
+            postings.append(doc_id)
+
+        words = set(tokenize(title_lower))
+        body_id = -1
+        if text:
+            body_id = self._body(text)
+            self.body_docs[body_id].append(doc_id)
+            # Bodies such as a file's folder repeat across many documents
+            cached = self._token_cache.get(text)
+            if cached is None:
+                if len(self._token_cache) > 10000:
+                    self._token_cache.clear()
+                cached = self._token_cache[text] = tokenize(text)
+            words.update(cached)
+        for word in words:
+            postings = self.tokens.get(word)
+            if postings is None:
+                postings = self.tokens[word] = array('i')
+                self._vocab = None
+            postings.append(doc_id)
+
+        count = len(grams) + len(words) + (body_id >= 0)
+        self.docs.append((key, title, title_lower, data, body_id, count))
+        self.ids[key] = doc_id
+        self.live_postings += count
+
+    def _body(self, text: str) -> int:
+        body_id = self.body_ids.get(text)
+        if body_id is None:
+            body_id = self.body_ids[text] = len(self.bodies)
+            text_lower = text.lower()
+            self.bodies.append(text_lower)
+            self.body_docs.append(array('i'))
+            for gram in trigrams(text_lower):
+                postings = self.body_grams.get(gram)
+                if postings is None:
+                    postings = self.body_grams[gram] = array('i')
+                postings.append(body_id)
+        return body_id
+
+    def remove(self, key):
+        doc_id = self.ids.pop(key, None)
+        if doc_id is None:
+            return
+        count = self.docs[doc_id][5]
+        self.docs[doc_id] = None
+        self.live_postings -= count
+        self.dead_postings += count
+        if self.dead_postings > max(COMPACT_MIN_POSTINGS, self.live_postings):
+            self.compact()
+
+    def compact(self):
+        """Rebuild the postings from the live documents only"""
+        live = [doc for doc in self.docs if doc is not None]
+        texts = {body_id: text for text, body_id in self.body_ids.items()}
+        self.__init__()
+        for key, title, _, data, body_id, _ in live:
+            self.add(key, title, texts[body_id] if body_id >= 0 else "", data)
+
+    @staticmethod
+    def _candidates(grams: Dict[str, array], query: str) -> set:
+        postings = []
+        for gram in trigrams(query):
+            found = grams.get(gram)
+            if not found:
+                return set()
+            postings.append(found)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for found in postings[1:]:
+            candidates.intersection_update(found)
+        return candidates
+
+    def substring_matches(self, query: str) -> Iterable[int]:
+        """Live documents whose title contains query"""
+        docs = self.docs
+        if len(query) < 3:
+            return [i for i, doc in enumerate(docs) if doc is not None and query in doc[2]]
+        return [
+            i for i in self._candidates(self.grams, query)
+            if docs[i] is not None and query in docs[i][2]
+        ]
+
+    def body_matches(self, query: str) -> Iterable[int]:
+        """Documents whose body contains query, tombstones included"""
+        bodies, body_docs = self.bodies, self.body_docs
+        matches = []
+        for body_id in self._candidates(self.body_grams, query):
+            if query in bodies[body_id]:
+                matches.extend(body_docs[body_id])
+        return matches
+
+    def ranked(self, query: str, words: List[str]) -> Dict[int, Iterable[int]]:
+        """Matching document ids grouped by score, tombstones included"""
+        ranked = {}
+        docs = self.docs
+        for doc_id in self.substring_matches(query):
+            title_lower = docs[doc_id][2]
+            if title_lower == query:
+                score = TITLE_EXACT
+            elif title_lower.startswith(query):
+                score = TITLE_PREFIX
+            else:
+                score = TITLE_SUBSTRING
+            ranked.setdefault(score, []).append(doc_id)
+        if len(query) >= 3:
+            ranked[BODY_SUBSTRING] = self.body_matches(query)
+
+        if words:
+            all_exact = all_prefixed = None
+            for word in words:
+                exact, prefixed = self.word_matches(word)
+                all_exact = exact if all_exact is None else all_exact & exact
+                all_prefixed = prefixed if all_prefixed is None else all_prefixed & prefixed
+                if not all_prefixed:
+                    break
+            ranked[WORDS_EXACT] = all_exact
+            ranked[WORDS_PREFIX] = all_prefixed - all_exact
+        return ranked
+
+    def word_matches(self, word: str) -> Tuple[set, set]:
+        """Documents containing word exactly, and containing a word starting with it.
+
+        The prefix expansion stops after MAX_PREFIX_EXPANSION words or
+        MAX_PREFIX_POSTINGS postings, so a very common prefix may miss some
+        documents that only match through a word prefix.
+        """
+        exact = set(self.tokens.get(word, ()))
+        prefixed = set(exact)
+        if self._vocab is None:
+            self._vocab = sorted(self.tokens)
+        vocab = self._vocab
+        start = bisect_left(vocab, word)
+        gathered = len(exact)
+        for token in vocab[start:start + MAX_PREFIX_EXPANSION]:
+            if not token.startswith(word) or gathered >= MAX_PREFIX_POSTINGS:
+                break
+            if token != word:
+                postings = self.tokens[token]
+                prefixed.update(postings)
+                gathered += len(postings)
+        return exact, prefixed
+
+
+class SearchIndex:
+    """Ranked search over files, todos, kanban tasks and notes.
+
+    Each kind of document is indexed separately so a kind can be rebuilt
+    (for example on every folder scan) without touching the others.
+    """
+    KINDS = ("file", "todo", "kanban", "note")
+
+    def __init__(self):
+        self.kinds = {kind: _KindIndex() for kind in self.KINDS}
+
+    def add(self, kind: str, key: Hashable, title: str, text: str = "", data: object = None):
+        """Index a document, replacing any previous one with the same key"""
+        self.kinds[kind].add(key, title, text, data)
+
+    def add_many(self, kind: str, docs: Iterable[Tuple[Hashable, str, str, object]]):
+        """Index (key, title, text, data) tuples"""
+        index = self.kinds[kind]
+        for key, title, text, data in docs:
+            index.add(key, title, text, data)
+
+    def remove(self, kind: str, key: Hashable):
+        """Drop a document from the index"""
+        self.kinds[kind].remove(key)
+
+    def clear(self, kind: str):
+        """Drop every document of one kind"""
+        self.kinds[kind] = _KindIndex()
+
+    def search(self, query: str, kinds: Iterable[str] = None, limit: int = 200) -> List[SearchResult]:
+        """Find documents matching query, best matches first.
+
+        A title equal to, starting with or containing the query ranks above
+        documents that only contain all of the query's words (or words
+        starting with them) somewhere in their title or body, and those
+        above documents whose body contains the query; bodies are only
+        searched for queries of three or more characters. Within a rank
+        shorter titles come first, and only the documents that make the
+        limit are looked at, so broad queries stay cheap.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        words = tokenize(query)
+
+        matches = [(kind, self.kinds[kind]) for kind in kinds or self.KINDS]
+        matches = [(kind, index, index.ranked(query, words)) for kind, index in matches]
+
+        results = []
+        seen = set()
+        for score in RANKS:
+            room = limit - len(results)
+            if room <= 0:
+                break
+            hits = []
+            for kind, index, ranked in matches:
+                docs = index.docs
+                ids = [i for i in ranked.get(score, ()) if docs[i] is not None and (kind, i) not in seen]
+                if len(ids) > room:
+                    ids = heapq.nsmallest(room, ids, key=lambda i: len(docs[i][1]))
+                hits.extend((len(docs[i][1]), kind, i, docs[i]) for i in ids)
+            hits.sort(key=lambda hit: hit[0])
+            for _, kind, doc_id, doc in hits[:room]:
+                seen.add((kind, doc_id))
+                results.append(SearchResult(score, kind, doc[0], doc[1], doc[3]))
+        return results
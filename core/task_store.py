@@ -0,0 +1,125 @@
+"""
+Task Store - Todos and kanban tasks saved one change at a time
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS todos (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    is_pinned INTEGER NOT NULL DEFAULT 0,
+    created_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS kanban_tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    due_date TEXT,
+    is_pinned INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# kind -> (table, columns besides id)
+TABLES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'todo': ('todos', ('title', 'priority', 'completed', 'is_pinned', 'created_date')),
+    'kanban': ('kanban_tasks', ('title', 'status', 'priority', 'description', 'due_date', 'is_pinned')),
+}
+
+
+class TaskStore:
+    """SQLite store of todos and kanban tasks under ~/.workspace_organizer/.
+
+    Every add, edit and delete is its own small statement touching one
+    row, so saving costs the same with ten tasks or fifty thousand and
+    nothing is lost if the app exits without warning. Tasks come back in
+    the order they were added, read in batches as the caller iterates.
+    """
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path or Path.home() / ".workspace_organizer" / "tasks.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the store usable from worker threads
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _table(kind: str, fields) -> Tuple[str, Tuple[str, ...]]:
+        table, columns = TABLES[kind]
+        unknown = set(fields) - set(columns)
+        if unknown:
+            raise ValueError(f"Unknown {kind} fields: {', '.join(sorted(unknown))}")
+        return table, columns
+
+    def add(self, kind: str, fields: dict) -> Optional[int]:
+        """Save a new task and return its id"""
+        table, _ = self._table(kind, fields)
+        names = list(fields)
+        try:
+            with self._connect() as conn:
+                return conn.execute(
+                    f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                    [fields[name] for name in names]
+                ).lastrowid
+        except sqlite3.Error as e:
+            print(f"Warning: Could not save {kind}: {e}")
+            return None
+
+    def update(self, kind: str, task_id: int, **fields):
+        """Change some fields of a saved task"""
+        if task_id is None or not fields:
+            return
+        table, _ = self._table(kind, fields)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f"UPDATE {table} SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ?",
+                    [*fields.values(), task_id]
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: Could not update {kind}: {e}")
+
+    def delete(self, kind: str, task_id: int):
+        """Forget a saved task"""
+        if task_id is None:
+            return
+        table, _ = TABLES[kind]
+        try:
+            with self._connect() as conn:
+                conn.execute(f"DELETE FROM {table} WHERE id = ?", (task_id,))
+        except sqlite3.Error as e:
+            print(f"Warning: Could not delete {kind}: {e}")
+
+    def load(self, kind: str, batch_size: int = 2000) -> Iterator[dict]:
+        """Yield every saved task of a kind, oldest first, with its id"""
+        table, columns = TABLES[kind]
+        select = f"SELECT id, {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?"
+        last = 0
+        while True:
+            try:
+                with self._connect() as conn:
+                    rows = conn.execute(select, (last, batch_size)).fetchall()
+            except sqlite3.Error as e:
+                print(f"Warning: Could not load {kind} tasks: {e}")
+                return
+            if not rows:
+                return
+            for row in rows:
+                yield dict(zip(('id',) + columns, row))
+            last = rows[-1][0]
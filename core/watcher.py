@@ -0,0 +1,85 @@
+"""
+Folder Watcher - Detect changed directories by polling their mtimes
+"""
+
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from core.scanner import FileScanner, ScanEntry
+
+
+class DirChange(NamedTuple):
+    """Fresh listing of a changed directory; files is None if it is gone"""
+    path: str
+    mtime_ns: int
+    files: Optional[List[ScanEntry]]
+    subdirs: List[str]
+
+
+class FolderWatcher:
+    """Watch the directories of a scanned tree for added, removed or renamed entries.
+
+    Every poll stats each watched directory. A directory whose mtime
+    moved is re-listed and reported whole, so the receiver can diff it
+    against what it already has; new subdirectories within max_depth are
+    listed and watched from then on, and vanished ones are reported with
+    files=None along with everything watched below them. Changes to a
+    file's contents that keep its directory entry (in-place writes) do
+    not touch the directory mtime and are picked up by the next scan.
+    """
+
+    def __init__(self, root: str, max_depth: int = 3, scanner: FileScanner = None):
+        self.root = root
+        self.max_depth = max_depth
+        self.scanner = scanner or FileScanner(max_workers=1)
+        # dir path -> (mtime_ns, depth)
+        self.dirs: Dict[str, Tuple[int, int]] = {}
+
+    def watch(self, listings: Dict[str, Tuple[int, list, list]]):
+        """Start from ScanIndex listings ({path: (mtime_ns, files, subdirs)})"""
+        root_depth = self.root.rstrip(os.sep).count(os.sep)
+        for dir_path, (mtime_ns, _, _) in listings.items():
+            depth = dir_path.rstrip(os.sep).count(os.sep) - root_depth
+            if depth <= self.max_depth:
+                self.dirs[dir_path] = (mtime_ns, depth)
+
+    def poll(self) -> List[DirChange]:
+        """Re-list every directory that changed since the last poll"""
+        changes = []
+        gone = []
+        for dir_path, (mtime_ns, depth) in list(self.dirs.items()):
+            try:
+                current = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                gone.append(dir_path)
+                continue
+            if current != mtime_ns:
+                self._relist(dir_path, depth, current, changes)
+
+        for dir_path in gone:
+            # A parent's removal may already have dropped this one
+            if self.dirs.pop(dir_path, None) is not None:
+                changes.append(DirChange(dir_path, -1, None, []))
+                prefix = os.path.join(dir_path, '')
+                for child in [d for d in self.dirs if d.startswith(prefix)]:
+                    del self.dirs[child]
+                    changes.append(DirChange(child, -1, None, []))
+        return changes
+
+    def _relist(self, dir_path, depth, mtime_ns, changes):
+        listing = self.scanner.list_dir(dir_path)
+        if listing is None:
+            # Try again on the next poll
+            self.dirs.setdefault(dir_path, (-1, depth))
+            return
+        files, subdirs = listing
+        self.dirs[dir_path] = (mtime_ns, depth)
+        changes.append(DirChange(dir_path, mtime_ns, files, subdirs))
+        if depth < self.max_depth:
+            for subdir in subdirs:
+                if subdir not in self.dirs:
+                    try:
+                        sub_mtime = os.stat(subdir).st_mtime_ns
+                    except OSError:
+                        continue
+                    self._relist(subdir, depth + 1, sub_mtime, changes)
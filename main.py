@@ -14,6 +14,8 @@ import subprocess
 import platform
 import csv
 from io import StringIO
+from itertools import islice
+from collections import Counter
 
 try:
     from PyQt6.QtWidgets import (
@@ -23,7 +25,7 @@ try:
         QTabWidget, QPlainTextEdit, QMessageBox, QComboBox, QMenuBar, QMenu,
         QProgressBar, QSpinBox, QCheckBox, QDialog, QTableWidget, QTableWidgetItem,
         QHeaderView, QDoubleSpinBox, QTreeWidget, QTreeWidgetItem, QProgressBar,
-        QSystemTrayIcon
+        QSystemTrayIcon, QTableView, QProgressDialog
     )
     from PyQt6.QtCore import Qt, QDate, QSize, QTimer, pyqtSignal, QThread, QDateTime, QTime
     from PyQt6.QtGui import QIcon, QFont, QColor, QPixmap, QImage, QLinearGradient, QKeySequence, QShortcut
@@ -36,8 +38,13 @@ except ImportError as e:
 
 try:
     from ui.styles import get_stylesheet
+    from ui.workers import ScanWorker, DuplicateWorker, OrganizeWorker, UndoWorker, WatchWorker, PdfExportWorker
+    from ui.models import FileTableModel, FolderTreeItem, format_size
     from core.file_manager import FileManager
+    from core.metrics import DIMENSIONS
     from core.notes_manager import NotesManager
+    from core.search_index import SearchIndex
+    from core.task_store import TaskStore
 except ImportError as e:
     print(f"❌ Error importing modules: {e}")
     traceback.print_exc()
@@ -62,6 +69,7 @@ class TodoItem:
         self.completed = False
         self.created_date = datetime.now()
         self.is_pinned = False  # NEW: Pin/star functionality
+        self.id = None  # Row in the task store, once saved
 
 
 class KanbanTask:
@@ -74,6 +82,7 @@ class KanbanTask:
         self.due_date = None  # Optional due date
         self.color = self.get_priority_color()  # Color based on priority
         self.is_pinned = False  # Pin/star functionality
+        self.id = None  # Row in the task store, once saved
     
     def get_priority_color(self):
         """Get color based on priority level"""
@@ -90,6 +99,9 @@ class KanbanTask:
 
 
 class WorkspaceOrganizer(QMainWindow):
+    # Search filter choices and the index kinds they cover
+    SEARCH_KINDS = {"Files": ("file",), "Todos": ("todo",), "Kanban": ("kanban",), "Notes": ("note",)}
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Workspace Organizer v4.0 - Advanced File Management")
@@ -99,12 +111,22 @@ class WorkspaceOrganizer(QMainWindow):
         # Initialize managers
         self.file_manager = FileManager()
         self.notes_manager = NotesManager()
+        self.task_store = TaskStore()
         
         # Theme state
         self.dark_mode = True  # Default to dark mode
         self.current_folder = None
-        self.all_files = []
-        self.filtered_files = []
+        self.files_model = FileTableModel(
+            self.file_manager.store,
+            trigrams=self.file_manager.config.get('trigram_file_filter', False)
+        )
+        self.scan_worker = None
+        self.scan_notify = False
+        self.duplicate_worker = None
+        self.organize_worker = None
+        self.undo_worker = None
+        self.pdf_worker = None
+        self.watch_worker = None
         
         # Productivity features
         self.todos = []
@@ -112,6 +134,8 @@ class WorkspaceOrganizer(QMainWindow):
         self.pomodoro = PomodoroTimer()
         
         # Search features
+        self.search_index = SearchIndex()
+        self.index_notes()
         self.search_history = []  # Store last 10 searches
         self.search_results = []  # Current search results
         self.max_history = 10
@@ -153,8 +177,9 @@ class WorkspaceOrganizer(QMainWindow):
         desktop_path = str(Path.home() / "Desktop")
         self.current_folder = desktop_path
         self.scan_folder_auto(desktop_path)
-        self.refresh_dashboard()
         self.setup_timers()
+        # Saved tasks are read once the window is up
+        QTimer.singleShot(0, self.load_tasks)
         
     def setup_menu_bar(self):
         """Setup the menu bar with File and View options"""
@@ -227,6 +252,12 @@ class WorkspaceOrganizer(QMainWindow):
         export_notes_action = export_menu.addAction("📄 Export Notes to PDF")
         export_notes_action.triggered.connect(self.export_notes_pdf)
         
+        export_notes_jsonl_action = export_menu.addAction("🗃️ Export Notes to JSON Lines")
+        export_notes_jsonl_action.triggered.connect(self.export_notes_jsonl)
+        
+        import_notes_jsonl_action = export_menu.addAction("📥 Import Notes from JSON Lines")
+        import_notes_jsonl_action.triggered.connect(self.import_notes_jsonl)
+        
         export_calendar_action = export_menu.addAction("📅 Export Calendar to iCal")
         export_calendar_action.triggered.connect(self.export_calendar_ical)
         
@@ -719,6 +750,7 @@ Streak: {self.stats['current_streak']} days"""
         value_label = QLabel(value)
         value_label.setStyleSheet(f"font-size: 20px; font-weight: bold; color: #667eea;")
         layout.addWidget(value_label)
+        frame.value_label = value_label
         
         return frame
     
@@ -748,6 +780,9 @@ Streak: {self.stats['current_streak']} days"""
         stats_layout.addWidget(self.storage_stat_card, 0, 1)
         stats_layout.addWidget(self.notes_stat_card, 0, 2)
         stats_layout.addWidget(self.types_stat_card, 0, 3)
+        self.files_value_label = self.file_stat_card.value_label
+        self.storage_value_label = self.storage_stat_card.value_label
+        self.types_value_label = self.types_stat_card.value_label
         
         layout.addLayout(stats_layout)
         layout.addSpacing(20)
@@ -845,31 +880,19 @@ Streak: {self.stats['current_streak']} days"""
             return
         
         filter_type = self.search_filter.currentText()
+        kinds = self.SEARCH_KINDS.get(filter_type)
         results = []
         
-        # Search files
-        if filter_type in ["All", "Files"]:
-            for file_info in self.all_files:
-                if query in file_info['name'].lower() or query in file_info['type'].lower() or query in file_info['path'].lower():
-                    results.append(("📄 File", file_info['name'], file_info))
-        
-        # Search todos
-        if filter_type in ["All", "Todos"]:
-            for i, todo in enumerate(self.todos):
-                if query in todo.title.lower():
-                    results.append(("✓ Todo", todo.title, todo))
-        
-        # Search kanban tasks
-        if filter_type in ["All", "Kanban"]:
-            for i, task in enumerate(self.kanban_tasks):
-                if query in task.title.lower():
-                    results.append(("📌 Kanban", task.title, task))
-        
-        # Search notes
-        if filter_type in ["All", "Notes"]:
-            notes_text = self.notes_text.toPlainText().lower() if hasattr(self, 'notes_text') else ""
-            if query in notes_text:
-                results.append(("📝 Notes", f"Found in notes content", None))
+        for hit in self.search_index.search(query, kinds):
+            if hit.kind == 'file':
+                # File hits carry their store record; resolve the path on demand
+                results.append(("📄 File", hit.title, self.file_manager.store.path(hit.key)))
+            elif hit.kind == 'todo':
+                results.append(("✓ Todo", hit.title, hit.data))
+            elif hit.kind == 'kanban':
+                results.append(("📌 Kanban", hit.title, hit.data))
+            else:
+                results.append(("📝 Notes", hit.title, hit.key))
         
         # Display results
         self.search_results_list.clear()
@@ -893,6 +916,130 @@ Streak: {self.stats['current_streak']} days"""
                 self.search_history.pop()
             self.update_search_history_display()
     
+    def index_files(self, records):
+        """Add scanned store records to the search index"""
+        store = self.file_manager.store
+        names, dirs, dir_ids = store.names, store.dirs, store.dir_ids
+        self.search_index.add_many('file', ((i, names[i], dirs[dir_ids[i]], None) for i in records))
+    
+    def index_todo(self, todo):
+        """Add or refresh a todo in the search index"""
+        self.search_index.add('todo', id(todo), todo.title, todo.priority, todo)
+    
+    def index_kanban_task(self, task):
+        """Add or refresh a kanban task in the search index"""
+        text = f"{task.status} {task.priority} {task.description}"
+        self.search_index.add('kanban', id(task), task.title, text, task)
+    
+    def load_tasks(self):
+        """Load saved todos and kanban tasks, a batch per turn of the event loop"""
+        self.task_loader = self.iter_task_batches()
+        self.load_next_task_batch()
+    
+    def load_next_task_batch(self):
+        """Add the next batch of saved tasks and schedule the one after"""
+        if next(self.task_loader, False):
+            QTimer.singleShot(0, self.load_next_task_batch)
+    
+    def iter_task_batches(self, batch_size=500):
+        """Add saved tasks to their lists and the search index, yielding after each batch"""
+        kinds = (
+            ('todo', self.todos, self.todo_from_row, self.todo_key, self.todo_lists, self.todo_item),
+            ('kanban', self.kanban_tasks, self.kanban_task_from_row, self.kanban_key, self.kanban_columns, self.kanban_item),
+        )
+        for kind, tasks, from_row, key_of, lists, make_item in kinds:
+            rows = self.task_store.load(kind, batch_size)
+            while True:
+                batch = [from_row(row) for row in islice(rows, batch_size)]
+                if not batch:
+                    break
+                # Looked up per batch: a theme change rebuilds the list widgets
+                self.insert_loaded_tasks(tasks, batch, key_of, lists(), make_item)
+                index = self.index_todo if kind == 'todo' else self.index_kanban_task
+                for task in batch:
+                    index(task)
+                yield True
+    
+    @staticmethod
+    def todo_from_row(row):
+        """A TodoItem from a task store row"""
+        todo = TodoItem(row['title'], row['priority'])
+        todo.id = row['id']
+        todo.completed = bool(row['completed'])
+        todo.is_pinned = bool(row['is_pinned'])
+        try:
+            todo.created_date = datetime.fromisoformat(row['created_date'])
+        except ValueError:
+            pass
+        return todo
+    
+    @staticmethod
+    def kanban_task_from_row(row):
+        """A KanbanTask from a task store row"""
+        task = KanbanTask(row['title'], row['status'], row['priority'])
+        task.id = row['id']
+        task.description = row['description']
+        task.due_date = row['due_date']
+        task.is_pinned = bool(row['is_pinned'])
+        return task
+    
+    @staticmethod
+    def insert_loaded_tasks(tasks, batch, key_of, lists, make_item):
+        """Put a batch of saved tasks ahead of any added since loading began.
+        
+        Tasks added meanwhile were saved after every stored one, so they are
+        the trailing tasks with a higher (or no) id. Each list keeps its
+        pinned rows first, both in task order.
+        """
+        position = len(tasks)
+        while position and (tasks[position - 1].id is None or tasks[position - 1].id > batch[0].id):
+            position -= 1
+        
+        pinned_before, pinned_total, unpinned_before = Counter(), Counter(), Counter()
+        for i, task in enumerate(tasks):
+            key = key_of(task)
+            if task.is_pinned:
+                pinned_total[key] += 1
+                if i < position:
+                    pinned_before[key] += 1
+            elif i < position:
+                unpinned_before[key] += 1
+        
+        for task in batch:
+            key = key_of(task)
+            list_widget = lists.get(key)
+            if list_widget is None:
+                continue
+            if task.is_pinned:
+                row = pinned_before[key]
+                pinned_before[key] += 1
+                pinned_total[key] += 1
+            else:
+                row = pinned_total[key] + unpinned_before[key]
+                unpinned_before[key] += 1
+            list_widget.insertItem(row, make_item(task))
+        tasks[position:position] = batch
+    
+    @staticmethod
+    def task_row(tasks, task, key_of):
+        """Row of task in its list, where pinned tasks come first and both groups keep task order"""
+        key = key_of(task)
+        row = 0
+        passed = False
+        for other in tasks:
+            if other is task:
+                if task.is_pinned:
+                    return row
+                passed = True
+            elif key_of(other) == key and (other.is_pinned or not (task.is_pinned or passed)):
+                row += 1
+        return row
+    
+    def index_notes(self):
+        """Index every saved note"""
+        for note in self.notes_manager.iter_notes():
+            self.search_index.add('note', note.get('id'), note.get('title', ''), note.get('content', ''))
+    
     def update_search_history_display(self):
         """Update the search history list display"""
         self.search_history_list.clear()
@@ -964,7 +1111,12 @@ Streak: {self.stats['current_streak']} days"""
         
         # Folder tree
         self.folder_tree = QTreeWidget()
-        self.folder_tree.setHeaderLabel("Folders & Subfolders")
+        self.folder_tree.setHeaderLabels(["Folders & Subfolders", "Size", "Files"])
+        self.folder_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.folder_tree.header().setStretchLastSection(False)
+        self.folder_tree.itemExpanded.connect(self.on_folder_expanded)
+        self.folder_tree.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.folder_tree.setSortingEnabled(True)
         self.populate_folder_tree()
         layout.addWidget(self.folder_tree)
         
@@ -984,38 +1136,96 @@ Streak: {self.stats['current_streak']} days"""
         return widget
     
     def populate_folder_tree(self):
-        """Populate folder tree with current folder and subfolders"""
+        """Show the current folder as the tree root; children load when expanded"""
         self.folder_tree.clear()
         
         if not self.current_folder or not os.path.isdir(self.current_folder):
             return
         
         try:
-            root_item = QTreeWidgetItem(self.folder_tree)
+            root_item = self.create_folder_item(self.folder_tree, os.path.basename(self.current_folder), self.current_folder)
             root_item.setText(0, os.path.basename(self.current_folder))
-            root_item.setData(0, Qt.ItemDataRole.UserRole, self.current_folder)
-            
-            self.add_subfolders(root_item, self.current_folder)
             self.folder_tree.expandItem(root_item)
         except Exception as e:
             print(f"Error populating folder tree: {e}")
     
-    def add_subfolders(self, parent_item, folder_path, max_depth=3, current_depth=0):
-        """Recursively add subfolders to tree"""
-        if current_depth >= max_depth:
+    def create_folder_item(self, parent, name, folder_path):
+        """Tree item for a folder, shown as expandable until it is listed"""
+        item = FolderTreeItem(parent)
+        item.setText(0, f"📁 {name}")
+        item.setData(0, Qt.ItemDataRole.UserRole, folder_path)
+        item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+        item.set_usage(*self.file_manager.disk_usage.usage(folder_path))
+        return item
+    
+    def refresh_folder_usage(self):
+        """Update size and file counts of the folders listed so far"""
+        if not hasattr(self, 'folder_tree'):
             return
         
-        try:
-            for item in sorted(os.listdir(folder_path)):
-                full_path = os.path.join(folder_path, item)
-                if os.path.isdir(full_path) and not item.startswith('.'):
-                    child_item = QTreeWidgetItem(parent_item)
-                    child_item.setText(0, f"📁 {item}")
-                    child_item.setData(0, Qt.ItemDataRole.UserRole, full_path)
-                    
-                    self.add_subfolders(child_item, full_path, max_depth, current_depth + 1)
-        except PermissionError:
-            pass
+        usage = self.file_manager.disk_usage.usage
+        self.folder_tree.setSortingEnabled(False)
+        pending = [self.folder_tree.topLevelItem(i) for i in range(self.folder_tree.topLevelItemCount())]
+        while pending:
+            item = pending.pop()
+            item.set_usage(*usage(item.data(0, Qt.ItemDataRole.UserRole)))
+            pending.extend(item.child(i) for i in range(item.childCount()))
+        self.folder_tree.setSortingEnabled(True)
+    
+    def apply_folder_tree_changes(self, changes):
+        """Add and remove tree items for folders the watcher saw come and go"""
+        if not hasattr(self, 'folder_tree'):
+            return
+        
+        items = {}
+        pending = [self.folder_tree.topLevelItem(i) for i in range(self.folder_tree.topLevelItemCount())]
+        while pending:
+            item = pending.pop()
+            items[item.data(0, Qt.ItemDataRole.UserRole)] = item
+            pending.extend(item.child(i) for i in range(item.childCount()))
+        
+        self.folder_tree.setSortingEnabled(False)
+        for change in changes:
+            item = items.get(change.path)
+            if item is None:
+                continue
+            if change.files is None:
+                parent = item.parent()
+                if parent is not None:
+                    parent.removeChild(item)
+                continue
+            # Folders not yet expanded are listed when they are
+            if item.childIndicatorPolicy() == QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator:
+                continue
+            subdirs = {path for path in change.subdirs if not os.path.basename(path).startswith('.')}
+            for i in reversed(range(item.childCount())):
+                if item.child(i).data(0, Qt.ItemDataRole.UserRole) not in subdirs:
+                    item.takeChild(i)
+            listed = {item.child(i).data(0, Qt.ItemDataRole.UserRole) for i in range(item.childCount())}
+            for path in sorted(subdirs - listed):
+                self.create_folder_item(item, os.path.basename(path), path)
+        self.folder_tree.setSortingEnabled(True)
+    
+    def on_folder_expanded(self, item):
+        """List a folder's subfolders when its tree item is opened"""
+        folder_path = item.data(0, Qt.ItemDataRole.UserRole)
+        subfolders = self.file_manager.list_subfolders(folder_path)
+        # Marks the item as listed, including folders with no subfolders
+        item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless)
+        
+        # Listings are cached by folder mtime, so re-opening an unchanged
+        # folder keeps its existing (possibly expanded) children
+        current = [item.child(i).data(0, Qt.ItemDataRole.UserRole) for i in range(item.childCount())]
+        if current == [path for _, path in subfolders]:
+            return
+        
+        self.folder_tree.setUpdatesEnabled(False)
+        self.folder_tree.setSortingEnabled(False)
+        item.takeChildren()
+        for name, path in subfolders:
+            self.create_folder_item(item, name, path)
+        self.folder_tree.setSortingEnabled(True)
+        self.folder_tree.setUpdatesEnabled(True)
     
     def open_selected_folder(self):
         """Open selected folder from tree"""
@@ -1025,7 +1235,6 @@ Streak: {self.stats['current_streak']} days"""
             if folder_path:
                 self.current_folder = folder_path
                 self.scan_folder_auto(folder_path)
-                self.refresh_dashboard()
                 QMessageBox.information(self, "Folder Changed", f"Now scanning: {folder_path}")
     
     def copy_folder_path(self):
@@ -1094,34 +1303,69 @@ Streak: {self.stats['current_streak']} days"""
         """Add new todo item"""
         text = self.todo_input.text().strip()
         if text:
-            self.todos.append(TodoItem(text))
+            todo = TodoItem(text)
+            todo.id = self.task_store.add('todo', {
+                'title': todo.title,
+                'priority': todo.priority,
+                'created_date': todo.created_date.isoformat()
+            })
+            self.todos.append(todo)
+            self.index_todo(todo)
             self.todo_input.clear()
-            self.update_todo_list_display()
+            # A new todo is unpinned and newest, so it goes last
+            self.todo_list.addItem(self.todo_item(todo))
     
     def delete_todo(self):
         """Delete selected todo"""
         current = self.todo_list.currentRow()
-        if current >= 0:
-            self.todos.pop(current)
-            self.update_todo_list_display()
+        if current >= 0 and self.todo_list.item(current):
+            todo = self.todo_list.item(current).data(Qt.ItemDataRole.UserRole)
+            if todo is not None:
+                self.todos.remove(todo)
+                self.task_store.delete('todo', todo.id)
+                self.search_index.remove('todo', id(todo))
+                self.todo_list.takeItem(current)
     
     def delete_kanban_task(self, column_list):
         """Delete selected kanban task"""
         current = column_list.currentRow()
         if current >= 0 and column_list.item(current):
-            original_index = column_list.item(current).data(Qt.ItemDataRole.UserRole)
-            if original_index is not None and original_index < len(self.kanban_tasks):
-                self.kanban_tasks.pop(original_index)
-                self.update_kanban_display()
+            task = column_list.item(current).data(Qt.ItemDataRole.UserRole)
+            if task is not None:
+                self.kanban_tasks.remove(task)
+                self.task_store.delete('kanban', task.id)
+                self.search_index.remove('kanban', id(task))
+                column_list.takeItem(current)
     
     def toggle_todo_complete(self, item):
         """Toggle todo completion when clicked (double-click)"""
-        current = self.todo_list.row(item)
-        if current >= 0 and current < len(self.todos):
-            self.todos[current].completed = not self.todos[current].completed
-            if self.todos[current].completed:
+        todo = item.data(Qt.ItemDataRole.UserRole)
+        if todo is not None:
+            todo.completed = not todo.completed
+            self.task_store.update('todo', todo.id, completed=int(todo.completed))
+            if todo.completed:
                 self.increment_tasks_completed()
-            self.update_todo_list_display()
+            self.todo_item(todo, item)
+    
+    @staticmethod
+    def todo_key(todo):
+        """All todos share one list"""
+        return None
+    
+    def todo_lists(self):
+        """The todo list widget, keyed like todo_key"""
+        return {None: self.todo_list}
+    
+    @staticmethod
+    def todo_item(todo, item=None):
+        """A todo list row showing todo, or item updated to show it"""
+        if item is None:
+            item = QListWidgetItem()
+            item.setData(Qt.ItemDataRole.UserRole, todo)
+        pin_icon = "📌" if todo.is_pinned else "  "
+        complete_icon = "✓" if todo.completed else "○"
+        item.setText(f"{pin_icon} {complete_icon} {todo.title}")
+        return item
     
     def update_todo_list_display(self):
         """Update todo list display with pinned items at top"""
@@ -1131,15 +1375,11 @@ Streak: {self.stats['current_streak']} days"""
         # Sort: pinned items first, then regular items
         pinned_todos = [t for t in self.todos if t.is_pinned]
         regular_todos = [t for t in self.todos if not t.is_pinned]
-        sorted_todos = pinned_todos + regular_todos
         
-        for i, todo in enumerate(sorted_todos):
-            pin_icon = "📌" if todo.is_pinned else "  "
-            complete_icon = "✓" if todo.completed else "○"
-            item_text = f"{pin_icon} {complete_icon} {todo.title}"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, self.todos.index(todo))  # Store original index
-            self.todo_list.addItem(item)
+        self.todo_list.setUpdatesEnabled(False)
+        for todo in pinned_todos + regular_todos:
+            self.todo_list.addItem(self.todo_item(todo))
+        self.todo_list.setUpdatesEnabled(True)
         
         self.todo_list.itemDoubleClicked.connect(self.toggle_todo_complete)
     
@@ -1147,10 +1387,13 @@ Streak: {self.stats['current_streak']} days"""
         """Pin/unpin selected todo"""
         current = self.todo_list.currentRow()
         if current >= 0 and self.todo_list.item(current):
-            original_index = self.todo_list.item(current).data(Qt.ItemDataRole.UserRole)
-            if original_index is not None and original_index < len(self.todos):
-                self.todos[original_index].is_pinned = not self.todos[original_index].is_pinned
-                self.update_todo_list_display()
+            todo = self.todo_list.item(current).data(Qt.ItemDataRole.UserRole)
+            if todo is not None:
+                todo.is_pinned = not todo.is_pinned
+                self.task_store.update('todo', todo.id, is_pinned=int(todo.is_pinned))
+                item = self.todo_list.takeItem(current)
+                self.todo_list.insertItem(self.task_row(self.todos, todo, self.todo_key), self.todo_item(todo, item))
+                self.todo_list.setCurrentItem(item)
     
     def show_todo_context_menu(self, pos):
         """Show right-click context menu for todos"""
@@ -1163,9 +1406,9 @@ Streak: {self.stats['current_streak']} days"""
         # Pin/Unpin action
         current = self.todo_list.row(item)
         if current >= 0:
-            original_index = item.data(Qt.ItemDataRole.UserRole)
-            if original_index is not None and original_index < len(self.todos):
-                is_pinned = self.todos[original_index].is_pinned
+            todo = item.data(Qt.ItemDataRole.UserRole)
+            if todo is not None:
+                is_pinned = todo.is_pinned
                 pin_action = menu.addAction("📌 Unpin" if is_pinned else "📌 Pin")
                 pin_action.triggered.connect(self.pin_todo)
         
@@ -1222,6 +1465,7 @@ Streak: {self.stats['current_streak']} days"""
         columns_layout.addWidget(self.kanban_todo_list)
         columns_layout.addWidget(self.kanban_progress_list)
         columns_layout.addWidget(self.kanban_done_list)
+        self.update_kanban_display()
         
         layout.addLayout(columns_layout)
         
@@ -1282,70 +1526,84 @@ Streak: {self.stats['current_streak']} days"""
         if text:
             priority = self.kanban_priority.currentText()
             task = KanbanTask(text, "To Do", priority)
+            task.id = self.task_store.add('kanban', {
+                'title': task.title,
+                'status': task.status,
+                'priority': task.priority
+            })
             self.kanban_tasks.append(task)
+            self.index_kanban_task(task)
             self.kanban_input.clear()
-            self.update_kanban_display()
+            # A new task is unpinned and newest, so it goes last in its column
+            list_widget = self.kanban_columns().get(task.status)
+            if list_widget is not None:
+                list_widget.addItem(self.kanban_item(task))
+    
+    @staticmethod
+    def kanban_key(task):
+        """Tasks are listed in the column of their status"""
+        return task.status
+    
+    def kanban_columns(self):
+        """Column list widgets keyed by status"""
+        # An empty QListWidget is falsy, so callers test for None
+        return {
+            "To Do": getattr(self.kanban_todo_list, 'list_widget', None),
+            "In Progress": getattr(self.kanban_progress_list, 'list_widget', None),
+            "Done": getattr(self.kanban_done_list, 'list_widget', None),
+        }
+    
+    @staticmethod
+    def kanban_item(task, item=None):
+        """A kanban column row showing task, or item updated to show it"""
+        if item is None:
+            item = QListWidgetItem()
+            item.setData(Qt.ItemDataRole.UserRole, task)
+        pin_icon = "📌" if task.is_pinned else "  "
+        priority_icon = {"High": "🔴", "Normal": "🟠", "Low": "🔵"}.get(task.priority, "🟠")
+        item.setText(f"{pin_icon} {priority_icon} {task.title}")
+        
+        # Set background color based on priority
+        item.setBackground(QColor(task.color))
+        item.setForeground(QColor("white"))
+        return item
     
     def update_kanban_display(self):
         """Update Kanban board display with pinned items at top"""
-        # Get the list widgets from the stored references
-        todo_list = getattr(self.kanban_todo_list, 'list_widget', None)
-        progress_list = getattr(self.kanban_progress_list, 'list_widget', None)
-        done_list = getattr(self.kanban_done_list, 'list_widget', None)
-        
-        # Clear all lists
-        if todo_list:
-            todo_list.clear()
-        if progress_list:
-            progress_list.clear()
-        if done_list:
-            done_list.clear()
+        columns = self.kanban_columns()
+        for list_widget in columns.values():
+            if list_widget is not None:
+                list_widget.clear()
+                list_widget.setUpdatesEnabled(False)
         
         # Add tasks to appropriate columns (pinned first)
-        for task in self.kanban_tasks:
-            pin_icon = "📌" if task.is_pinned else "  "
-            priority_icon = {"High": "🔴", "Normal": "🟠", "Low": "🔵"}.get(task.priority, "🟠")
-            task_item = QListWidgetItem(f"{pin_icon} {priority_icon} {task.title}")
-            task_item.setData(Qt.ItemDataRole.UserRole, self.kanban_tasks.index(task))
-            
-            # Set background color based on priority
-            task_item.setBackground(QColor(task.color))
-            task_item.setForeground(QColor("white"))
-            
-            if task.status == "To Do" and todo_list:
-                todo_list.addItem(task_item)
-            elif task.status == "In Progress" and progress_list:
-                progress_list.addItem(task_item)
-            elif task.status == "Done" and done_list:
-                done_list.addItem(task_item)
-        
-        # Re-sort each column to put pinned items first
-        for list_widget in [todo_list, progress_list, done_list]:
-            if list_widget:
-                self._sort_kanban_column(list_widget)
-    
-    def _sort_kanban_column(self, column_list):
-        """Sort a kanban column to put pinned items first"""
-        items = []
-        for i in range(column_list.count()):
-            item = column_list.takeItem(0)
-            items.append(item)
-        
-        # Sort: pinned items first
-        pinned = [item for item in items if item.text().startswith("📌")]
-        unpinned = [item for item in items if not item.text().startswith("📌")]
-        
-        for item in pinned + unpinned:
-            column_list.addItem(item)
+        pinned = [t for t in self.kanban_tasks if t.is_pinned]
+        unpinned = [t for t in self.kanban_tasks if not t.is_pinned]
+        for task in pinned + unpinned:
+            list_widget = columns.get(task.status)
+            if list_widget is not None:
+                list_widget.addItem(self.kanban_item(task))
+        
+        for list_widget in columns.values():
+            if list_widget is not None:
+                list_widget.setUpdatesEnabled(True)
+    
+    def place_kanban_task(self, task, item):
+        """Put a taken kanban item back at its task's row in its column"""
+        list_widget = self.kanban_columns().get(task.status)
+        if list_widget is not None:
+            list_widget.insertItem(self.task_row(self.kanban_tasks, task, self.kanban_key), self.kanban_item(task, item))
+            list_widget.setCurrentItem(item)
     
     def pin_kanban_task(self, column_list):
         """Pin/unpin selected kanban task"""
         current = column_list.currentRow()
         if current >= 0 and column_list.item(current):
-            original_index = column_list.item(current).data(Qt.ItemDataRole.UserRole)
-            if original_index is not None and original_index < len(self.kanban_tasks):
-                self.kanban_tasks[original_index].is_pinned = not self.kanban_tasks[original_index].is_pinned
-                self.update_kanban_display()
+            task = column_list.item(current).data(Qt.ItemDataRole.UserRole)
+            if task is not None:
+                task.is_pinned = not task.is_pinned
+                self.task_store.update('kanban', task.id, is_pinned=int(task.is_pinned))
+                self.place_kanban_task(task, column_list.takeItem(current))
     
     def show_kanban_context_menu(self, pos, column_list):
         """Show right-click context menu for kanban tasks with priority and status options"""
@@ -1357,10 +1615,8 @@ Streak: {self.stats['current_streak']} days"""
         
         current = column_list.row(item)
         if current >= 0:
-            original_index = item.data(Qt.ItemDataRole.UserRole)
-            if original_index is not None and original_index < len(self.kanban_tasks):
-                task = self.kanban_tasks[original_index]
-                
+            task = item.data(Qt.ItemDataRole.UserRole)
+            if task is not None:
                 # Pin/Unpin action
                 is_pinned = task.is_pinned
                 pin_action = menu.addAction("📌 Unpin" if is_pinned else "📌 Pin")
@@ -1395,20 +1651,24 @@ Streak: {self.stats['current_streak']} days"""
         """Set priority for selected kanban task"""
         current = column_list.currentRow()
         if current >= 0 and column_list.item(current):
-            original_index = column_list.item(current).data(Qt.ItemDataRole.UserRole)
-            if original_index is not None and original_index < len(self.kanban_tasks):
-                self.kanban_tasks[original_index].priority = priority
-                self.kanban_tasks[original_index].update_color()
-                self.update_kanban_display()
+            task = column_list.item(current).data(Qt.ItemDataRole.UserRole)
+            if task is not None:
+                task.priority = priority
+                task.update_color()
+                self.task_store.update('kanban', task.id, priority=priority)
+                self.index_kanban_task(task)
+                self.kanban_item(task, column_list.item(current))
     
     def move_kanban_task(self, column_list, new_status):
         """Move kanban task to different status"""
         current = column_list.currentRow()
         if current >= 0 and column_list.item(current):
-            original_index = column_list.item(current).data(Qt.ItemDataRole.UserRole)
-            if original_index is not None and original_index < len(self.kanban_tasks):
-                self.kanban_tasks[original_index].status = new_status
-                self.update_kanban_display()
+            task = column_list.item(current).data(Qt.ItemDataRole.UserRole)
+            if task is not None:
+                task.status = new_status
+                self.task_store.update('kanban', task.id, status=new_status)
+                self.index_kanban_task(task)
+                self.place_kanban_task(task, column_list.takeItem(current))
     
     def create_pomodoro_tab(self):
         """Create Pomodoro timer tab"""
@@ -1555,41 +1815,54 @@ Streak: {self.stats['current_streak']} days"""
         self.file_search_input = QLineEdit()
         self.file_search_input.setPlaceholderText("Search files...")
         self.file_search_input.setStyleSheet(f"background-color: {'#2d2d2d' if self.dark_mode else 'white'}; color: {'#e0e0e0' if self.dark_mode else '#333'}; border: 2px solid #667eea; border-radius: 5px; padding: 8px;")
-        self.file_search_input.textChanged.connect(self.filter_files)
+        self.file_search_input.setText(self.files_model.filter_text)
+        self.file_search_input.textChanged.connect(self.schedule_filter_files)
+        
+        # Debounce typing so a burst of keystrokes filters once
+        self.file_filter_timer = QTimer(widget)
+        self.file_filter_timer.setSingleShot(True)
+        self.file_filter_timer.setInterval(120)
+        self.file_filter_timer.timeout.connect(self.filter_files)
         filter_layout.addWidget(self.file_search_input)
         
         layout.addLayout(filter_layout)
         
+        # Scan progress
+        scan_layout = QHBoxLayout()
+        
+        self.scan_status_label = QLabel("")
+        self.scan_status_label.setStyleSheet("color: #667eea; font-size: 11px; font-weight: bold;")
+        scan_layout.addWidget(self.scan_status_label)
+        scan_layout.addStretch()
+        
+        self.cancel_scan_btn = QPushButton("⏹ Cancel Scan")
+        self.cancel_scan_btn.clicked.connect(self.cancel_scan)
+        self.cancel_scan_btn.setStyleSheet("background-color: #ef4444; color: white; border: none; border-radius: 5px; padding: 6px 12px; font-weight: bold;")
+        self.cancel_scan_btn.setVisible(self.scan_worker is not None)
+        scan_layout.addWidget(self.cancel_scan_btn)
+        
+        layout.addLayout(scan_layout)
+        
         # File table
-        self.files_table = QTableWidget()
-        self.files_table.setColumnCount(5)
-        self.files_table.setHorizontalHeaderLabels(["Name", "Size", "Type", "Modified", "Path"])
-        self.populate_files_table()
+        self.files_table = QTableView()
+        self.files_table.setModel(self.files_model)
+        self.files_table.horizontalHeader().setSortIndicator(self.files_model.sort_column, self.files_model.sort_order)
+        self.files_table.setSortingEnabled(True)
+        self.files_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        # Fixed row heights let the view skip measuring rows it never shows
+        self.files_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.files_table.verticalHeader().setDefaultSectionSize(24)
         layout.addWidget(self.files_table)
         
         return widget
     
-    def populate_files_table(self):
-        """Populate files table"""
-        self.files_table.setRowCount(len(self.all_files))
-        for row, file_info in enumerate(self.all_files):
-            self.files_table.setItem(row, 0, QTableWidgetItem(file_info['name']))
-            self.files_table.setItem(row, 1, QTableWidgetItem(file_info['size']))
-            self.files_table.setItem(row, 2, QTableWidgetItem(file_info['type']))
-            self.files_table.setItem(row, 3, QTableWidgetItem(file_info['modified']))
-            self.files_table.setItem(row, 4, QTableWidgetItem(file_info['path']))
+    def schedule_filter_files(self):
+        """Filter files once typing pauses"""
+        self.file_filter_timer.start()
     
     def filter_files(self):
         """Filter files based on search"""
-        search_text = self.file_search_input.text().lower()
-        self.filtered_files = [f for f in self.all_files if search_text in f['name'].lower()]
-        self.files_table.setRowCount(len(self.filtered_files))
-        for row, file_info in enumerate(self.filtered_files):
-            self.files_table.setItem(row, 0, QTableWidgetItem(file_info['name']))
-            self.files_table.setItem(row, 1, QTableWidgetItem(file_info['size']))
-            self.files_table.setItem(row, 2, QTableWidgetItem(file_info['type']))
-            self.files_table.setItem(row, 3, QTableWidgetItem(file_info['modified']))
-            self.files_table.setItem(row, 4, QTableWidgetItem(file_info['path']))
+        self.files_model.set_filter(self.file_search_input.text())
     
     def create_organization_tab(self):
         """Create organization tab"""
@@ -1623,11 +1896,50 @@ Streak: {self.stats['current_streak']} days"""
         dup_btn.setStyleSheet("background-color: #f59e0b; color: white; border: none; border-radius: 5px; padding: 12px; font-weight: bold;")
         layout.addWidget(dup_btn)
         
+        undo_btn = QPushButton("↩️ Undo Last Organize")
+        undo_btn.clicked.connect(self.undo_organize)
+        undo_btn.setStyleSheet("background-color: #6b7280; color: white; border: none; border-radius: 5px; padding: 12px; font-weight: bold;")
+        layout.addWidget(undo_btn)
+        
         cleanup_btn = QPushButton("🧹 Cleanup Empty Folders")
         cleanup_btn.clicked.connect(self.cleanup_dialog)
         cleanup_btn.setStyleSheet("background-color: #ef4444; color: white; border: none; border-radius: 5px; padding: 12px; font-weight: bold;")
         layout.addWidget(cleanup_btn)
         
+        # Organize progress
+        org_status_layout = QHBoxLayout()
+        self.org_status_label = QLabel("")
+        self.org_status_label.setStyleSheet("color: #667eea; font-size: 11px; font-weight: bold;")
+        org_status_layout.addWidget(self.org_status_label)
+        
+        self.org_progress = QProgressBar()
+        self.org_progress.setVisible(False)
+        org_status_layout.addWidget(self.org_progress)
+        
+        self.cancel_org_btn = QPushButton("⏹ Cancel")
+        self.cancel_org_btn.clicked.connect(self.cancel_organize)
+        self.cancel_org_btn.setStyleSheet("background-color: #ef4444; color: white; border: none; border-radius: 5px; padding: 6px 12px; font-weight: bold;")
+        self.cancel_org_btn.setVisible(False)
+        org_status_layout.addWidget(self.cancel_org_btn)
+        layout.addLayout(org_status_layout)
+        
+        # Duplicate search progress
+        dup_status_layout = QHBoxLayout()
+        self.dup_status_label = QLabel("")
+        self.dup_status_label.setStyleSheet("color: #f59e0b; font-size: 11px; font-weight: bold;")
+        dup_status_layout.addWidget(self.dup_status_label)
+        
+        self.dup_progress = QProgressBar()
+        self.dup_progress.setVisible(False)
+        dup_status_layout.addWidget(self.dup_progress)
+        
+        self.cancel_dup_btn = QPushButton("⏹ Cancel")
+        self.cancel_dup_btn.clicked.connect(self.cancel_find_duplicates)
+        self.cancel_dup_btn.setStyleSheet("background-color: #ef4444; color: white; border: none; border-radius: 5px; padding: 6px 12px; font-weight: bold;")
+        self.cancel_dup_btn.setVisible(False)
+        dup_status_layout.addWidget(self.cancel_dup_btn)
+        layout.addLayout(dup_status_layout)
+        
         layout.addStretch()
         
         return widget
@@ -1670,11 +1982,37 @@ Streak: {self.stats['current_streak']} days"""
         
         self.analytics_text = QTextEdit()
         self.analytics_text.setReadOnly(True)
+        font = QFont("Consolas")
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        self.analytics_text.setFont(font)
         self.analytics_text.setStyleSheet(f"background-color: {'#2d2d2d' if self.dark_mode else 'white'}; color: {'#e0e0e0' if self.dark_mode else '#333'}; border: 2px solid #667eea; border-radius: 5px; padding: 8px;")
         layout.addWidget(self.analytics_text)
         
         return widget
     
+    def refresh_analytics(self):
+        """Render the Analytics tab from the scan's metrics cube"""
+        metrics = self.file_manager.metrics
+        store = self.file_manager.store
+        titles = {
+            'category': "📂 By category",
+            'extension': "🏷️ Top extensions",
+            'age': "🕒 By last modified",
+            'depth': "📐 By folder depth",
+        }
+        
+        lines = [f"📁 {metrics.file_count} files · 💾 {format_size(metrics.total_size)}"]
+        for dimension in DIMENSIONS:
+            rows = metrics.breakdown(store, dimension)
+            if dimension == 'extension':
+                rows = rows[:15]
+            lines += ["", f"{titles[dimension]}:"]
+            largest = max((size for _, _, size in rows), default=0) or 1
+            for label, count, size in rows:
+                bar = "█" * max(1, round(20 * size / largest)) if size else ""
+                lines.append(f"  {str(label):<12} {count:>9} files {format_size(size):>10}  {bar}")
+        self.analytics_text.setPlainText("\n".join(lines))
+    
     def create_calendar_tab(self):
         """Create calendar tab"""
         widget = QWidget()
@@ -1834,52 +2172,132 @@ Streak: {self.stats['current_streak']} days"""
         
         return widget
     
-    def scan_folder_auto(self, folder_path):
-        """Auto scan folder without dialog"""
+    def scan_folder_auto(self, folder_path, notify=False):
+        """Scan folder in the background, streaming files into the table"""
         if os.path.isdir(folder_path):
+            self.cancel_scan()
+            self.stop_watching()
             self.current_folder = folder_path
-            file_paths = self.file_manager.scan_folder(folder_path)
-            
-            # Convert file paths to dictionaries
-            self.all_files = []
-            for file_path in file_paths:
-                try:
-                    file_stat = os.stat(file_path)
-                    file_size = file_stat.st_size
-                    file_name = os.path.basename(file_path)
-                    file_ext = os.path.splitext(file_name)[1]
-                    mod_time = datetime.fromtimestamp(file_stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-                    
-                    # Format size
-                    if file_size < 1024:
-                        size_str = f"{file_size} B"
-                    elif file_size < 1024 ** 2:
-                        size_str = f"{file_size / 1024:.1f} KB"
-                    elif file_size < 1024 ** 3:
-                        size_str = f"{file_size / (1024**2):.1f} MB"
-                    else:
-                        size_str = f"{file_size / (1024**3):.1f} GB"
-                    
-                    self.all_files.append({
-                        'name': file_name,
-                        'size': size_str,
-                        'type': file_ext or 'File',
-                        'modified': mod_time,
-                        'path': file_path
-                    })
-                except:
-                    pass
-            
+            self.file_manager.clear_store(folder_path)
+            self.files_model.reset()
+            self.search_index.clear('file')
             self.folder_info_label.setText(f"📂 Folder: {os.path.basename(folder_path)}")
-            self.populate_files_table()
+            self.populate_folder_tree()
+            
+            self.scan_notify = notify
+            self.scan_worker = ScanWorker(self.file_manager, folder_path)
+            self.scan_worker.batch_ready.connect(self.on_scan_batch)
+            self.scan_worker.progress.connect(self.on_scan_progress)
+            self.scan_worker.scan_finished.connect(self.on_scan_finished)
+            self.scan_status_label.setText("⏳ Scanning...")
+            self.cancel_scan_btn.setVisible(True)
+            self.scan_worker.start()
+    
+    def cancel_scan(self):
+        """Stop the running background scan, if any"""
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+            self.scan_worker.wait()
+            self.scan_worker = None
+            self.cancel_scan_btn.setVisible(False)
+            self.files_model.settle()
+            self.scan_status_label.setText("⏹ Scan cancelled")
+    
+    def on_scan_batch(self, entries):
+        """Append a batch of scanned files to the files table"""
+        # Signals queued by a cancelled worker may still arrive
+        if self.sender() is not self.scan_worker:
+            return
+        
+        records = self.file_manager.add_entries(entries)
+        self.files_model.records_added(records)
+        self.index_files(records)
+        self.scan_worker.batch_done()
+    
+    def on_scan_progress(self, dirs_visited, files_found, bytes_seen):
+        """Show background scan progress"""
+        if self.sender() is not self.scan_worker:
+            return
+        
+        self.scan_status_label.setText(
+            f"⏳ Scanning... {dirs_visited} folders · {files_found} files · {format_size(bytes_seen)}"
+        )
+        self.refresh_folder_usage()
+    
+    def on_scan_finished(self, completed):
+        """Finish a background scan"""
+        if self.sender() is not self.scan_worker:
+            return
+        
+        # scan_finished is the worker's last signal; let run() return
+        # before the thread object is released
+        self.scan_worker.wait()
+        self.scan_worker = None
+        self.cancel_scan_btn.setVisible(False)
+        self.files_model.settle()
+        file_count = self.file_manager.store.file_count
+        self.scan_status_label.setText(f"✅ Scanned {file_count} files" if completed else "⚠️ Scan stopped")
+        self.refresh_folder_usage()
+        self.refresh_dashboard()
+        if completed and self.file_manager.config.get('watch_folders', True):
+            self.start_watching(self.current_folder)
+        
+        if self.scan_notify and completed:
+            QMessageBox.information(self, "Scan Complete", f"Scanned {file_count} files")
+    
+    def start_watching(self, folder_path):
+        """Keep the scanned files of folder_path current without rescanning"""
+        self.stop_watching()
+        self.watch_worker = WatchWorker(
+            self.file_manager, folder_path,
+            interval=self.file_manager.config.get('watch_interval', 2.0)
+        )
+        self.watch_worker.changes_ready.connect(self.on_folder_changes)
+        self.watch_worker.start()
+    
+    def stop_watching(self):
+        """Stop the folder watcher, if any"""
+        if self.watch_worker is not None:
+            self.watch_worker.stop()
+            self.watch_worker.wait()
+            self.watch_worker = None
+    
+    def refresh_current_folder(self):
+        """Pick up changes made to the current folder"""
+        if self.watch_worker is not None:
+            self.watch_worker.poll_now()
+        elif self.current_folder:
+            self.scan_folder_auto(self.current_folder)
+    
+    def on_folder_changes(self, changes):
+        """Apply directories re-listed by the watcher to the store and views"""
+        if self.sender() is not self.watch_worker:
+            return
+        
+        removed, added = self.file_manager.apply_changes(changes)
+        if not removed and not added:
+            # Folders may still have been created or deleted
+            self.apply_folder_tree_changes(changes)
+            return
+        
+        self.files_model.records_removed(removed)
+        self.files_model.records_added(added)
+        self.files_model.settle()
+        for record in removed:
+            self.search_index.remove('file', record)
+        self.index_files(added)
+        self.apply_folder_tree_changes(changes)
+        self.refresh_folder_usage()
+        self.refresh_dashboard()
+        self.scan_status_label.setText(
+            f"🔄 {len(added)} added, {len(removed)} removed · {self.file_manager.store.file_count} files"
+        )
     
     def scan_folder(self):
         """Scan folder for files"""
         folder_path = QFileDialog.getExistingDirectory(self, "Select Folder to Scan")
         if folder_path:
-            self.scan_folder_auto(folder_path)
-            self.refresh_dashboard()
-            QMessageBox.information(self, "Scan Complete", f"Scanned {len(self.all_files)} files")
+            self.scan_folder_auto(folder_path, notify=True)
     
     def open_in_vscode(self):
         """Open current folder in VS Code"""
@@ -1917,63 +2335,244 @@ Streak: {self.stats['current_streak']} days"""
     
     def organize_by_type(self):
         """Organize files by type"""
-        if not self.current_folder:
-            QMessageBox.warning(self, "No Folder", "Please scan a folder first")
-            return
-        
-        try:
-            # Count files before organization
-            files_count = len(self.all_files)
-            
-            self.file_manager.organize_by_type(self.current_folder)
-            
-            # Track organization
-            self.stats['files_organized_today'] += files_count
-            self.stats['total_files_organized'] += files_count
-            
-            QMessageBox.information(self, "Success", f"Files organized by type! ({files_count} files)")
-            self.scan_folder_auto(self.current_folder)
-            self.update_statistics_display()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Organization failed: {e}")
+        self.run_organize(self.file_manager.plan_organize_by_type, "type")
     
     def organize_by_date(self):
         """Organize files by date"""
+        self.run_organize(self.file_manager.plan_organize_by_date, "date")
+    
+    def run_organize(self, make_plan, label, preview_limit=15):
+        """Preview an organize plan, then carry it out in the background if confirmed"""
         if not self.current_folder:
             QMessageBox.warning(self, "No Folder", "Please scan a folder first")
             return
+        if self.scan_worker is not None or self.organize_worker is not None or self.undo_worker is not None:
+            QMessageBox.warning(self, "Busy", "Please wait for the current scan, organize or undo to finish")
+            return
         
         try:
-            # Count files before organization
-            files_count = len(self.all_files)
-            
-            self.file_manager.organize_by_date(self.current_folder)
+            plan = make_plan(self.current_folder)
+            if not plan.moves:
+                QMessageBox.information(self, "Nothing to Do", f"Files are already organized by {label}.")
+                return
             
-            # Track organization
-            self.stats['files_organized_today'] += files_count
-            self.stats['total_files_organized'] += files_count
+            # Dry run: show what would happen before anything is touched
+            preview = "\n".join(
+                f"{os.path.relpath(src, self.current_folder)}  →  {os.path.relpath(dst, self.current_folder)}"
+                for src, dst in plan.moves[:preview_limit]
+            )
+            if len(plan.moves) > preview_limit:
+                preview += f"\n... and {len(plan.moves) - preview_limit} more"
+            reply = QMessageBox.question(
+                self, f"Organize by {label.title()}",
+                f"{len(plan.moves)} files will be moved, {len(plan.dirs)} folders created, "
+                f"{plan.renamed} files renamed to avoid name collisions.\n\n{preview}\n\nProceed?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
             
-            QMessageBox.information(self, "Success", f"Files organized by date! ({files_count} files)")
-            self.scan_folder_auto(self.current_folder)
-            self.update_statistics_display()
+            self.organize_worker = OrganizeWorker(self.file_manager, plan, self.current_folder, label)
+            self.organize_worker.progress.connect(self.on_organize_progress)
+            self.organize_worker.organize_finished.connect(self.on_organize_finished)
+            self.org_status_label.setText(f"⏳ Organizing by {label}...")
+            self.org_progress.setMaximum(len(plan.moves))
+            self.org_progress.setValue(0)
+            self.org_progress.setVisible(True)
+            self.cancel_org_btn.setVisible(True)
+            self.organize_worker.start()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Organization failed: {e}")
     
+    def cancel_organize(self):
+        """Stop the running organize after the moves already started"""
+        if self.organize_worker is not None:
+            self.organize_worker.cancel()
+            self.org_status_label.setText("⏳ Stopping...")
+    
+    def on_organize_progress(self, done, total):
+        """Show organize progress"""
+        if self.sender() is not self.organize_worker:
+            return
+        
+        self.org_status_label.setText(f"⏳ Organizing by {self.organize_worker.label}... {done}/{total}")
+        self.org_progress.setValue(done)
+    
+    def on_organize_finished(self, result, completed):
+        """Finish a background organize run"""
+        if self.sender() is not self.organize_worker:
+            return
+        
+        # organize_finished is the worker's last signal; let run() return
+        # before the thread object is released
+        self.organize_worker.wait()
+        label = self.organize_worker.label
+        self.organize_worker = None
+        self.org_progress.setVisible(False)
+        self.cancel_org_btn.setVisible(False)
+        
+        # Track organization
+        self.stats['files_organized_today'] += result.moved
+        self.stats['total_files_organized'] += result.moved
+        
+        if completed:
+            self.org_status_label.setText(f"✅ Organized {result.moved} files by {label}")
+            message = f"Files organized by {label}! ({result.moved} files moved)"
+        else:
+            self.org_status_label.setText(f"⚠️ Organize stopped after {result.moved} files")
+            message = f"Organize stopped. {result.moved} files were moved and can be undone."
+        if result.failed:
+            message += f"\n\n{len(result.failed)} files could not be moved, e.g.:\n" + "\n".join(
+                f"{src}: {error}" for src, error in result.failed[:5]
+            )
+        QMessageBox.information(self, "Success" if completed else "Organize Stopped", message)
+        self.refresh_current_folder()
+        self.update_statistics_display()
+    
+    def undo_organize(self):
+        """Move the files of the last organize run back in the background"""
+        if self.scan_worker is not None or self.organize_worker is not None or self.undo_worker is not None:
+            QMessageBox.warning(self, "Busy", "Please wait for the current scan, organize or undo to finish")
+            return
+        run = self.file_manager.last_organize()
+        if not run:
+            QMessageBox.information(self, "Nothing to Undo", "No organize run to undo.")
+            return
+        
+        reply = QMessageBox.question(
+            self, "Undo Organize",
+            f"Undo organizing {run['folder']} by {run['label']} ({run['moves']} moves journaled on {run['time'][:16].replace('T', ' ')})?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        self.undo_worker = UndoWorker(self.file_manager, run)
+        self.undo_worker.progress.connect(self.on_undo_progress)
+        self.undo_worker.undo_finished.connect(self.on_undo_finished)
+        self.org_status_label.setText("⏳ Undoing organize...")
+        self.org_progress.setMaximum(max(run['moves'], 1))
+        self.org_progress.setValue(0)
+        self.org_progress.setVisible(True)
+        self.undo_worker.start()
+    
+    def on_undo_progress(self, done, total):
+        """Show undo progress"""
+        if self.sender() is not self.undo_worker:
+            return
+        
+        self.org_status_label.setText(f"⏳ Undoing organize... {done}/{total}")
+        self.org_progress.setValue(done)
+    
+    def on_undo_finished(self, result, error):
+        """Report the outcome of a background undo"""
+        if self.sender() is not self.undo_worker:
+            return
+        
+        # undo_finished is the worker's last signal; let run() return
+        # before the thread object is released
+        self.undo_worker.wait()
+        self.undo_worker = None
+        self.org_progress.setVisible(False)
+        if error:
+            self.org_status_label.setText("⚠️ Undo failed")
+            QMessageBox.critical(self, "Error", f"Undo failed: {error}")
+            return
+        
+        self.org_status_label.setText(f"↩️ Moved {result.moved} files back")
+        message = f"Moved {result.moved} files back."
+        if result.failed:
+            message += f"\n\n{len(result.failed)} files could not be moved back, e.g.:\n" + "\n".join(
+                f"{path}: {error}" for path, error in result.failed[:5]
+            )
+        QMessageBox.information(self, "Undo Complete", message)
+        if self.current_folder:
+            self.refresh_current_folder()
+    
     def find_duplicates(self):
-        """Find duplicate files"""
+        """Find duplicate files in the background"""
         if not self.current_folder:
             QMessageBox.warning(self, "No Folder", "Please scan a folder first")
             return
+        if self.duplicate_worker is not None:
+            return
         
-        try:
-            duplicates = self.file_manager.find_duplicates(self.current_folder)
-            if duplicates:
-                dup_text = "\n\n".join([f"{i+1}. {dup}" for i, dup in enumerate(duplicates)])
-                QMessageBox.information(self, "Duplicates Found", f"Found {len(duplicates)} duplicate groups:\n\n{dup_text}")
-            else:
-                QMessageBox.information(self, "No Duplicates", "No duplicate files found!")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Duplicate detection failed: {e}")
+        self.duplicate_worker = DuplicateWorker(self.file_manager, self.file_manager.sized_files())
+        self.duplicate_worker.progress.connect(self.on_duplicate_progress)
+        self.duplicate_worker.duplicates_found.connect(self.on_duplicates_found)
+        self.dup_status_label.setText("⏳ Comparing file sizes...")
+        self.dup_progress.setValue(0)
+        self.dup_progress.setVisible(True)
+        self.cancel_dup_btn.setVisible(True)
+        self.duplicate_worker.start()
+    
+    def cancel_find_duplicates(self):
+        """Stop the running duplicate search, if any"""
+        if self.duplicate_worker is not None:
+            self.duplicate_worker.cancel()
+            self.duplicate_worker.wait()
+            self.duplicate_worker = None
+            self.dup_progress.setVisible(False)
+            self.cancel_dup_btn.setVisible(False)
+            self.dup_status_label.setText("⏹ Duplicate search cancelled")
+    
+    def on_duplicate_progress(self, stage, done, total):
+        """Show duplicate search progress"""
+        if self.sender() is not self.duplicate_worker:
+            return
+        
+        stage_text = "Checking file ends" if stage == "partial" else "Hashing candidates"
+        self.dup_status_label.setText(f"⏳ {stage_text}... {done}/{total}")
+        self.dup_progress.setMaximum(max(total, 1))
+        self.dup_progress.setValue(done)
+    
+    def on_duplicates_found(self, duplicates, completed):
+        """Finish a background duplicate search"""
+        if self.sender() is not self.duplicate_worker:
+            return
+        
+        # duplicates_found is the worker's last signal; let run() return
+        # before the thread object is released
+        self.duplicate_worker.wait()
+        self.duplicate_worker = None
+        self.dup_progress.setVisible(False)
+        self.cancel_dup_btn.setVisible(False)
+        if not completed:
+            self.dup_status_label.setText("⚠️ Duplicate search stopped")
+            return
+        
+        self.dup_status_label.setText(f"✅ {len(duplicates)} duplicate groups")
+        if duplicates:
+            self.show_duplicates(duplicates)
+        else:
+            QMessageBox.information(self, "No Duplicates", "No duplicate files found!")
+    
+    def show_duplicates(self, duplicates, limit=20):
+        """Summarize duplicate groups, largest reclaimable space first"""
+        groups = []
+        for paths in duplicates.values():
+            try:
+                wasted = os.path.getsize(paths[0]) * (len(paths) - 1)
+            except OSError:
+                wasted = 0
+            groups.append((wasted, paths))
+        groups.sort(key=lambda group: group[0], reverse=True)
+        
+        total_wasted = sum(wasted for wasted, _ in groups)
+        lines = []
+        for i, (wasted, paths) in enumerate(groups[:limit]):
+            lines.append(f"{i+1}. {len(paths)} copies, {format_size(wasted)} reclaimable")
+            lines.extend(f"   {path}" for path in paths[:5])
+            if len(paths) > 5:
+                lines.append(f"   ... and {len(paths) - 5} more")
+            lines.append("")
+        dup_text = "\n".join(lines).rstrip()
+        if len(groups) > limit:
+            dup_text += f"\n\n... and {len(groups) - limit} more groups"
+        QMessageBox.information(
+            self, "Duplicates Found",
+            f"Found {len(groups)} duplicate groups ({format_size(total_wasted)} reclaimable):\n\n{dup_text}"
+        )
     
     def cleanup_dialog(self):
         """Show cleanup dialog"""
@@ -1989,7 +2588,7 @@ Streak: {self.stats['current_streak']} days"""
             try:
                 self.file_manager.cleanup_empty_folders(self.current_folder)
                 QMessageBox.information(self, "Success", "Empty folders removed!")
-                self.scan_folder_auto(self.current_folder)
+                self.refresh_current_folder()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Cleanup failed: {e}")
     
@@ -2012,7 +2611,9 @@ Streak: {self.stats['current_streak']} days"""
         """Save note"""
         text = self.notes_text.toPlainText()
         if text.strip():
-            self.notes_manager.save_note(text)
+            note_id = self.notes_manager.save_note(text)
+            note = self.notes_manager.get_note(note_id)
+            self.search_index.add('note', note_id, note.get('title', ''), text)
             self.notes_text.clear()
             QMessageBox.information(self, "Saved", "Note saved successfully!")
     
@@ -2022,39 +2623,27 @@ Streak: {self.stats['current_streak']} days"""
             return
         
         # Update stats
-        file_count = len(self.all_files)
-        storage_bytes = 0
-        for f in self.all_files:
-            try:
-                size_str = f.get('size', '0 B').split()[0]
-                if size_str.replace('.', '', 1).isdigit():
-                    storage_bytes += float(size_str)
-            except:
-                pass
-        
-        # Format storage
-        if storage_bytes < 1024:
-            storage_display = f"{storage_bytes:.1f} B"
-        elif storage_bytes < 1024 ** 2:
-            storage_display = f"{storage_bytes / 1024:.1f} KB"
-        elif storage_bytes < 1024 ** 3:
-            storage_display = f"{storage_bytes / (1024**2):.1f} MB"
-        else:
-            storage_display = f"{storage_bytes / (1024**3):.1f} GB"
+        metrics = self.file_manager.metrics
+        storage_display = format_size(metrics.total_size)
         
-        self.file_count_label.setText(f"📁 Files: {file_count}")
+        self.file_count_label.setText(f"📁 Files: {metrics.file_count}")
         self.storage_label.setText(f"💾 Storage: {storage_display}")
         
         # Update statistics cards with current data
-        self.file_stat_card = self.create_stat_card("📁 Files Scanned", str(file_count))
-        self.storage_stat_card = self.create_stat_card("💾 Storage Used", storage_display)
-        self.notes_stat_card = self.create_stat_card("📝 Tasks Completed", f"{self.stats['tasks_completed']}")
-        self.types_stat_card = self.create_stat_card("🔥 Current Streak", f"{self.stats['current_streak']} days")
+        self.files_value_label.setText(str(metrics.file_count))
+        self.storage_value_label.setText(storage_display)
+        self.types_value_label.setText(str(metrics.extension_count(self.file_manager.store)))
+        self.refresh_analytics()
         
-        # Update recent files
+        self.refresh_recent_files()
+    
+    def refresh_recent_files(self):
+        """List the most recently modified scanned files on the dashboard"""
         self.recent_files_list.clear()
-        for file_info in self.all_files[:10]:
-            self.recent_files_list.addItem(f"📄 {file_info['name']}")
+        for file_path in self.file_manager.get_recent_files(10):
+            item = QListWidgetItem(f"📄 {os.path.basename(file_path)}")
+            item.setToolTip(file_path)
+            self.recent_files_list.addItem(item)
     
     def update_statistics_display(self):
         """Update the statistics display on dashboard"""
@@ -2165,20 +2754,51 @@ Streak: {self.stats['current_streak']} days"""
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to export: {str(e)}")
     
+    def export_notes_jsonl(self):
+        """Export every saved note to a JSON Lines file"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Notes", "notes.jsonl.gz", "JSON Lines (*.jsonl.gz *.jsonl)"
+        )
+        if not file_path:
+            return
+        
+        try:
+            count = self.notes_manager.export_notes(file_path)
+            QMessageBox.information(self, "Export Success", f"Exported {count} notes to:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export: {str(e)}")
+    
+    def import_notes_jsonl(self):
+        """Import notes from a JSON Lines file"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Notes", "", "JSON Lines (*.jsonl.gz *.jsonl)"
+        )
+        if not file_path:
+            return
+        
+        try:
+            count = self.notes_manager.import_notes(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Import Error", f"Failed to import: {str(e)}")
+            return
+        self.index_notes()
+        QMessageBox.information(self, "Import Success", f"Imported {count} notes from:\n{file_path}")
+    
     def export_notes_pdf(self):
-        """Export notes to PDF file"""
+        """Export every saved note to a PDF file on a background thread"""
         try:
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-            from reportlab.lib.units import inch
+            import reportlab  # noqa: F401
         except ImportError:
             QMessageBox.warning(self, "Missing Dependency", 
                               "reportlab not installed. Install it with:\npip install reportlab")
             return
         
-        notes_text = self.notes_text.toPlainText() if hasattr(self, 'notes_text') else ""
-        if not notes_text.strip():
+        if self.pdf_worker is not None:
+            QMessageBox.warning(self, "Export", "A PDF export is already running.")
+            return
+        
+        total = self.notes_manager.note_count()
+        if not total:
             QMessageBox.warning(self, "Export", "No notes to export!")
             return
         
@@ -2186,48 +2806,43 @@ Streak: {self.stats['current_streak']} days"""
         if not file_path:
             return
         
-        try:
-            # Create PDF document
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Add title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor='#333333',
-                spaceAfter=30,
-                alignment=1  # Center
-            )
-            story.append(Paragraph("Workspace Organizer - Notes Export", title_style))
-            story.append(Spacer(1, 0.3*inch))
-            
-            # Add export date
-            date_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=10,
-                textColor='#666666',
-                spaceAfter=20
-            )
-            story.append(Paragraph(f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", date_style))
-            story.append(Spacer(1, 0.2*inch))
-            
-            # Add notes content
-            notes_lines = notes_text.split('\n')
-            for line in notes_lines:
-                if line.strip():
-                    story.append(Paragraph(line, styles['Normal']))
-                else:
-                    story.append(Spacer(1, 0.1*inch))
-            
-            # Build PDF
-            doc.build(story)
-            QMessageBox.information(self, "Export Success", f"Notes exported to:\n{file_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", f"Failed to export: {str(e)}")
+        self.pdf_progress = QProgressDialog(f"Exporting {total} notes to PDF...", "Cancel", 0, total, self)
+        self.pdf_progress.setWindowTitle("Export Notes")
+        self.pdf_progress.setMinimumDuration(0)
+        self.pdf_progress.canceled.connect(self.cancel_export_pdf)
+        
+        self.pdf_worker = PdfExportWorker(self.notes_manager, file_path, total)
+        self.pdf_worker.progress.connect(self.on_export_pdf_progress)
+        self.pdf_worker.export_finished.connect(self.on_export_pdf_finished)
+        self.pdf_worker.start()
+    
+    def cancel_export_pdf(self):
+        """Stop the running PDF export"""
+        if self.pdf_worker is not None:
+            self.pdf_worker.cancel()
+    
+    def on_export_pdf_progress(self, done, total):
+        """Show how far the PDF export has got"""
+        if self.sender() is not self.pdf_worker:
+            return
+        self.pdf_progress.setValue(done)
+    
+    def on_export_pdf_finished(self, count, completed, error):
+        """Report the outcome of a PDF export"""
+        if self.sender() is not self.pdf_worker:
+            return
+        
+        # export_finished is the worker's last signal; let run() return
+        # before the thread object is released
+        self.pdf_worker.wait()
+        file_path = self.pdf_worker.file_path
+        self.pdf_worker = None
+        self.pdf_progress.canceled.disconnect(self.cancel_export_pdf)
+        self.pdf_progress.close()
+        if completed:
+            QMessageBox.information(self, "Export Success", f"Exported {count} notes to:\n{file_path}")
+        elif error:
+            QMessageBox.critical(self, "Export Error", f"Failed to export: {error}")
     
     def export_calendar_ical(self):
         """Export calendar events to iCal format"""
@@ -2422,6 +3037,21 @@ END:VEVENT
         QMessageBox.information(self, "Settings", "Settings saved successfully!")
         dialog.close()
     
+    def closeEvent(self, event):
+        """Stop background work before the window closes"""
+        self.cancel_scan()
+        self.stop_watching()
+        self.cancel_find_duplicates()
+        if self.organize_worker is not None:
+            self.organize_worker.cancel()
+            self.organize_worker.wait()
+        if self.undo_worker is not None:
+            self.undo_worker.wait()
+        if self.pdf_worker is not None:
+            self.pdf_worker.cancel()
+            self.pdf_worker.wait()
+        super().closeEvent(event)
+    
     def show_about(self):
         """Show about dialog"""
         QMessageBox.information(self, "About",
@@ -0,0 +1,241 @@
+"""
+Item Models - Virtualized models for large views
+"""
+
+from array import array
+from datetime import datetime
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtWidgets import QTreeWidgetItem
+
+from core.file_filter import FileFilter
+
+
+def format_size(size):
+    """Format a byte count for display"""
+    if size < 1024:
+        return f"{size} B"
+    elif size < 1024 ** 2:
+        return f"{size / 1024:.1f} KB"
+    elif size < 1024 ** 3:
+        return f"{size / (1024**2):.1f} MB"
+    return f"{size / (1024**3):.1f} GB"
+
+
+class FileTableModel(QAbstractTableModel):
+    """Files table over a FileStore.
+
+    Cells are formatted only when the view asks for them, and sorting and
+    filtering rearrange an array of record indices instead of the records,
+    so memory and repaint cost do not grow with per-row Qt objects.
+    """
+    HEADERS = ["Name", "Size", "Type", "Modified", "Path"]
+
+    def __init__(self, store, trigrams=False, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.filter = FileFilter(store, trigrams)
+        self.filter_text = ""
+        self.sort_column = -1
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        # Every record in display order, and the visible (filtered) part of it
+        self._order = array('l')
+        self._rows = self._order
+        # Rank of each record in the display order; only relative order counts
+        self._positions = array('l')
+        self._next_position = 0
+        # Records at the end of the order not yet merged into the sort
+        self._unsorted = 0
+
+    def reset(self):
+        """Rebuild the view after the store was cleared or reloaded"""
+        self.beginResetModel()
+        self.filter.clear()
+        self.filter.add(range(len(self.store)))
+        self._set_order(self._sorted(self.store.records()))
+        self._rows = self.filter.query(self.filter_text, self._order, self._in_order)
+        self._unsorted = 0
+        self.endResetModel()
+
+    def records_added(self, records):
+        """Show records appended to the store, keeping filter and sort order"""
+        self.filter.add(records)
+        # Appended records go to the end of the order until the next sort
+        self._positions.extend(range(self._next_position, self._next_position + len(records)))
+        self._next_position += len(records)
+        new_rows = self.filter.match(self.filter_text, records)
+        if self._rows is not self._order:
+            self._order.extend(records)
+
+        if new_rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            self._rows.extend(new_rows)
+            self.endInsertRows()
+
+        # New records wait at the end and are merged once they make up a
+        # fixed share of the table, so a scan re-sorts O(log n) times
+        if self.sort_column >= 0:
+            self._unsorted += len(records)
+            if self._unsorted * 8 >= len(self._order):
+                self.settle()
+
+    def records_removed(self, records):
+        """Drop records removed from the store from the view"""
+        gone = set(records)
+        if not gone:
+            return
+        if self._rows is not self._order:
+            self._order = array('l', [i for i in self._order if i not in gone])
+        self._unsorted = min(self._unsorted, len(self._order))
+
+        # Remove contiguous runs of rows from the end so earlier row
+        # numbers stay valid; a scattered removal is cheaper as a reset
+        positions = [row for row, record in enumerate(self._rows) if record in gone]
+        runs = []
+        for row in positions:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        if len(runs) > 64:
+            self.beginResetModel()
+            rows = array('l', [i for i in self._rows if i not in gone])
+            if self._rows is self._order:
+                self._order = rows
+            self._rows = rows
+            self.endResetModel()
+            return
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+
+    def settle(self):
+        """Merge records appended since the last sort into the sort order"""
+        if self._unsorted and self.sort_column >= 0:
+            self._set_order(self._sorted(self._order))
+            self._relayout(self.filter.query(self.filter_text, self._order, self._in_order))
+        self._unsorted = 0
+
+    def set_filter(self, text):
+        """Show only files whose name contains text"""
+        self.filter_text = text.lower()
+        self.beginResetModel()
+        self._rows = self.filter.query(self.filter_text, self._order, self._in_order)
+        self.endResetModel()
+
+    def path_at(self, row):
+        """Get the file path shown at a view row"""
+        return self.store.path(self._rows[row])
+
+    def _sort_key(self, column):
+        store = self.store
+        if column == 0:
+            return self.filter.names_lower.__getitem__
+        elif column == 1:
+            return store.sizes.__getitem__
+        elif column == 2:
+            ext_keys = [ext.lower() for ext in store.ext_names]
+            return lambda i: ext_keys[store.ext_ids[i]]
+        elif column == 3:
+            return store.mtimes.__getitem__
+        return store.path
+
+    def _sorted(self, rows):
+        if self.sort_column < 0:
+            return array('l', sorted(rows))
+        return array('l', sorted(
+            rows,
+            key=self._sort_key(self.sort_column),
+            reverse=self.sort_order == Qt.SortOrder.DescendingOrder
+        ))
+
+    def _set_order(self, order):
+        self._order = order
+        positions = array('l', [0]) * len(self.store)
+        for position, record in enumerate(order):
+            positions[record] = position
+        self._positions = positions
+        self._next_position = len(order)
+
+    def _in_order(self, rows):
+        # Filter matches found out of order (trigram candidates) are put in
+        # the order's sequence, unsorted tail included, rather than re-sorted
+        # by the sort key, so rows do not jump while a scan is still settling
+        return sorted(rows, key=self._positions.__getitem__)
+
+    def _relayout(self, rows):
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        records = [self._rows[index.row()] for index in persistent]
+        self._rows = rows
+        self.changePersistentIndexList(persistent, [
+            self.index(rows.index(record), index.column())
+            for index, record in zip(persistent, records)
+        ])
+        self.layoutChanged.emit()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        store = self.store
+        record = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return store.names[record]
+            elif column == 1:
+                return format_size(store.sizes[record])
+            elif column == 2:
+                return store.ext(record) or 'File'
+            elif column == 3:
+                return datetime.fromtimestamp(store.mtimes[record]).strftime('%Y-%m-%d %H:%M')
+            return store.path(record)
+        elif role == Qt.ItemDataRole.ToolTipRole and column == 4:
+            return store.path(record)
+        elif role == Qt.ItemDataRole.UserRole:
+            return store.path(record)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self._set_order(self._sorted(self._order))
+        self._relayout(self.filter.query(self.filter_text, self._order, self._in_order))
+        self._unsorted = 0
+
+
+class FolderTreeItem(QTreeWidgetItem):
+    """Folder tree row with total size and file count columns.
+
+    The numbers are kept as sort keys next to their display text, so
+    sorting by size or count compares bytes and files, not strings.
+    """
+    SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+    def set_usage(self, size, count):
+        """Show a folder's cumulative size and file count"""
+        self.setText(1, format_size(size))
+        self.setData(1, self.SORT_ROLE, size)
+        self.setText(2, str(count))
+        self.setData(2, self.SORT_ROLE, count)
+
+    def __lt__(self, other):
+        tree = self.treeWidget()
+        column = tree.sortColumn() if tree else 0
+        if column in (1, 2):
+            return (self.data(column, self.SORT_ROLE) or 0) < (other.data(column, self.SORT_ROLE) or 0)
+        return self.text(column).lower() < other.text(column).lower()
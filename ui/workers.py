@@ -0,0 +1,254 @@
+"""
+Background Workers - QThread jobs that keep long operations off the GUI thread
+"""
+
+import time
+import threading
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.duplicates import find_duplicates
+from core.organizer import MoveResult
+
+
+class ScanWorker(QThread):
+    """Scan a folder and stream the files found back in batches"""
+    batch_ready = pyqtSignal(list)
+    progress = pyqtSignal(int, int, int)  # dirs visited, files found, bytes seen
+    scan_finished = pyqtSignal(bool)  # False when the scan was cancelled or failed
+
+    def __init__(self, file_manager, folder_path, max_depth=3, batch_size=1000, interval=0.1, max_pending=2):
+        super().__init__()
+        self.file_manager = file_manager
+        self.folder_path = folder_path
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self.interval = interval
+        self._cancelled = False
+        # Batches emitted but not yet consumed; bounding them keeps a fast
+        # scan from flooding the GUI event queue
+        self._pending = threading.Semaphore(max_pending)
+
+    def cancel(self):
+        """Ask the scan to stop after the directory being listed"""
+        self._cancelled = True
+
+    def batch_done(self):
+        """Called by the receiver once a batch has been added to the view"""
+        self._pending.release()
+
+    def _emit_batch(self, batch):
+        while not self._pending.acquire(timeout=0.05):
+            if self._cancelled:
+                return
+        self.batch_ready.emit(batch)
+
+    def run(self):
+        dirs_visited = files_found = bytes_seen = 0
+        batch = []
+        last_emit = time.monotonic()
+        completed = False
+
+        scan = self.file_manager.iter_scan(self.folder_path, self.max_depth)
+        try:
+            for files in scan:
+                if self._cancelled:
+                    break
+                dirs_visited += 1
+                files_found += len(files)
+                bytes_seen += sum(entry.size for entry in files)
+                batch.extend(files)
+
+                # Emit by size or time so the table fills smoothly on both
+                # huge flat folders and deep trees of small ones
+                now = time.monotonic()
+                if len(batch) >= self.batch_size or now - last_emit >= self.interval:
+                    self._emit_batch(batch)
+                    self.progress.emit(dirs_visited, files_found, bytes_seen)
+                    batch = []
+                    last_emit = now
+            else:
+                completed = True
+        except Exception as e:
+            print(f"Error scanning folder: {e}")
+        finally:
+            scan.close()
+
+        if batch and completed:
+            self._emit_batch(batch)
+        self.progress.emit(dirs_visited, files_found, bytes_seen)
+        self.scan_finished.emit(completed)
+
+
+class DuplicateWorker(QThread):
+    """Find duplicates among a snapshot of (path, size) pairs"""
+    progress = pyqtSignal(str, int, int)  # stage, files hashed, files in stage
+    duplicates_found = pyqtSignal(dict, bool)  # groups, False when cancelled or failed
+
+    def __init__(self, file_manager, files, interval=0.1):
+        super().__init__()
+        self.files = files
+        self.interval = interval
+        self.pool = file_manager.hash_pool(progress=self._on_progress)
+        self._last_progress = 0.0
+
+    def cancel(self):
+        """Stop hashing after the files being read"""
+        self.pool.cancel()
+
+    def _on_progress(self, stage, done, total):
+        now = time.monotonic()
+        if done == total or now - self._last_progress >= self.interval:
+            self._last_progress = now
+            self.progress.emit(stage, done, total)
+
+    def run(self):
+        try:
+            duplicates = find_duplicates(self.files, self.pool)
+        except Exception as e:
+            print(f"Error finding duplicates: {e}")
+            self.duplicates_found.emit({}, False)
+            return
+        self.duplicates_found.emit(duplicates, not self.pool.cancelled)
+
+
+class OrganizeWorker(QThread):
+    """Carry out an organize plan off the GUI thread"""
+    progress = pyqtSignal(int, int)  # files handled, files planned
+    organize_finished = pyqtSignal(object, bool)  # MoveResult, False when cancelled
+
+    def __init__(self, file_manager, plan, folder_path, label, interval=0.1):
+        super().__init__()
+        self.file_manager = file_manager
+        self.plan = plan
+        self.folder_path = folder_path
+        self.label = label
+        self.interval = interval
+        self.executor = file_manager.plan_executor(progress=self._on_progress)
+        self._last_progress = 0.0
+
+    def cancel(self):
+        """Stop after the moves already started"""
+        self.executor.cancel()
+
+    def _on_progress(self, done, total):
+        now = time.monotonic()
+        if done == total or now - self._last_progress >= self.interval:
+            self._last_progress = now
+            self.progress.emit(done, total)
+
+    def run(self):
+        try:
+            result = self.file_manager.execute_plan(self.plan, self.folder_path, self.label, self.executor)
+        except Exception as e:
+            print(f"Error organizing files: {e}")
+            result = MoveResult(0, [(self.folder_path, str(e))])
+            self.organize_finished.emit(result, False)
+            return
+        self.organize_finished.emit(result, not self.executor.cancelled)
+
+
+class UndoWorker(QThread):
+    """Move the files of a journaled organize run back off the GUI thread"""
+    progress = pyqtSignal(int, int)  # moves handled, moves journaled
+    undo_finished = pyqtSignal(object, str)  # MoveResult, error
+
+    def __init__(self, file_manager, run, interval=0.1):
+        super().__init__()
+        self.file_manager = file_manager
+        self.run_info = run
+        self.interval = interval
+        self._last_progress = 0.0
+
+    def _on_progress(self, done, total):
+        now = time.monotonic()
+        if done == total or now - self._last_progress >= self.interval:
+            self._last_progress = now
+            self.progress.emit(done, total)
+
+    def run(self):
+        try:
+            result = self.file_manager.undo_organize(self.run_info, self._on_progress)
+        except Exception as e:
+            print(f"Error undoing organize: {e}")
+            self.undo_finished.emit(MoveResult(0, []), str(e))
+            return
+        self.undo_finished.emit(result, "")
+
+
+class WatchWorker(QThread):
+    """Poll a scanned folder for changes and send back re-listed directories"""
+    changes_ready = pyqtSignal(list)  # DirChange list
+
+    def __init__(self, file_manager, folder_path, max_depth=3, interval=2.0):
+        super().__init__()
+        self.file_manager = file_manager
+        self.folder_path = folder_path
+        self.max_depth = max_depth
+        self.interval = interval
+        self._stopped = False
+        self._wake = threading.Event()
+
+    def stop(self):
+        """Stop watching"""
+        self._stopped = True
+        self._wake.set()
+
+    def poll_now(self):
+        """Check for changes without waiting for the next interval"""
+        self._wake.set()
+
+    def run(self):
+        try:
+            watcher = self.file_manager.watch(self.folder_path, self.max_depth)
+            while not self._stopped:
+                changes = watcher.poll()
+                if changes and not self._stopped:
+                    self.file_manager.record_changes(changes)
+                    self.changes_ready.emit(changes)
+                self._wake.wait(self.interval)
+                self._wake.clear()
+        except Exception as e:
+            print(f"Error watching folder: {e}")
+
+
+class PdfExportWorker(QThread):
+    """Write every saved note to a PDF off the GUI thread"""
+    progress = pyqtSignal(int, int)  # notes laid out, notes to export
+    export_finished = pyqtSignal(int, bool, str)  # notes exported, False when cancelled or failed, error
+
+    def __init__(self, notes_manager, file_path, total, interval=0.1):
+        super().__init__()
+        self.notes_manager = notes_manager
+        self.file_path = file_path
+        self.total = total
+        self.interval = interval
+        self._cancelled = False
+        self._last_progress = 0.0
+
+    def cancel(self):
+        """Stop at the next chunk of notes; no file is written"""
+        self._cancelled = True
+
+    def _on_progress(self, done, total):
+        now = time.monotonic()
+        if done == total or now - self._last_progress >= self.interval:
+            self._last_progress = now
+            self.progress.emit(done, total)
+
+    def run(self):
+        # reportlab is optional, so it is only imported once an export runs
+        from core.note_pdf import ExportCancelled, export_notes_pdf
+        try:
+            count = export_notes_pdf(
+                self.file_path, self.notes_manager.iter_notes(), self.total,
+                progress=self._on_progress, cancelled=lambda: self._cancelled
+            )
+        except ExportCancelled:
+            self.export_finished.emit(0, False, "")
+            return
+        except Exception as e:
+            print(f"Error exporting notes: {e}")
+            self.export_finished.emit(0, False, str(e))
+            return
+        self.export_finished.emit(count, True, "")